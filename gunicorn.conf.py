@@ -0,0 +1,50 @@
+import gc
+import multiprocessing
+import os
+
+# The app is imported once in the master and forked into the workers, so
+# its modules and templates are shared copy-on-write instead of loaded per
+# worker. The scheduler starts in each worker after the fork (see post_fork).
+os.environ.setdefault("SCHEDULER_AUTOSTART", "false")
+preload_app = True
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Threads overlap the waits on Postgres and Cloudinary within a worker; keep
+# workers * threads within what the database pool (DB_POOL_SIZE plus
+# DB_MAX_OVERFLOW per worker) and Postgres max_connections allow.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Recycle workers now and then so slow leaks cannot build up; the jitter
+# keeps them from all restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# nginx keeps connections to the app open between requests.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers in Docker.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # Everything allocated by the preload moves to the permanent generation,
+    # so collections in the workers do not touch (and copy) those pages.
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from website import db
+    from website.extensions import start_scheduler
+
+    # Connections opened by the master must not be shared with the workers.
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+    start_scheduler()
@@ -0,0 +1,39 @@
+from website import create_app, db
+from website.domain.models import Post
+from website.infrastructure.repositories import TagRepository
+from website.utils import extract_hashtags
+
+BATCH_SIZE = 500
+
+
+def backfill_tags():
+    """Rebuilds the post_tags rows of every existing post from its content."""
+
+    last_id = 0
+    updated = 0
+    while True:
+        posts = (
+            Post.query.filter(Post.id > last_id)
+            .order_by(Post.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not posts:
+            break
+
+        for post in posts:
+            post.tags = TagRepository.get_or_create(extract_hashtags(post.content))
+        db.session.commit()
+
+        updated += len(posts)
+        last_id = posts[-1].id
+        print(f"Tagged {updated} posts...")
+
+    print(f"Backfill finished, {updated} posts processed.")
+
+
+if __name__ == "__main__":
+    app = create_app(run_scheduler=False)
+
+    with app.app_context():
+        backfill_tags()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from website.config import Config
+from website.infrastructure.hashing import hash_code, verify_code
+
+# Compared with the configured method unless --method is given.
+CANDIDATES = ("scrypt:16384:8:1", "scrypt:32768:8:1", "pbkdf2:sha256:600000")
+
+
+def checks_per_second(method: str, seconds: float) -> float:
+    """Password checks one core completes per second; a login is one check."""
+
+    password_hash = generate_password_hash("correct horse battery", method=method)
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        check_password_hash(password_hash, "correct horse battery")
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+def code_checks_per_second(seconds: float) -> float:
+    code_hash = hash_code("token", "1234")
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        verify_code(code_hash, "token", "1234")
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+def benchmark(methods, seconds: float, processes: int):
+    print(f"{'method':<26} {'per core/s':>11} {f'{processes} cores/s':>12} {'ms':>8}")
+    for method in methods:
+        single = checks_per_second(method, seconds)
+        # One process per core, as gunicorn runs its workers.
+        with ProcessPoolExecutor(processes) as pool:
+            total = sum(
+                pool.map(checks_per_second, [method] * processes, [seconds] * processes)
+            )
+        print(f"{method:<26} {single:11.1f} {total:12.1f} {1000 / single:8.1f}")
+
+    rate = code_checks_per_second(seconds)
+    print(f"{'verification code HMAC':<26} {rate:11.0f} {'':>12} {1000 / rate:8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure password hash checks per second, to size login capacity."
+    )
+    parser.add_argument("--method", action="append", dest="methods")
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    methods = args.methods or list(
+        dict.fromkeys((Config.PASSWORD_HASH_METHOD, *CANDIDATES))
+    )
+    benchmark(methods, args.seconds, args.processes)
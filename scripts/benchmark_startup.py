@@ -0,0 +1,65 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+# Runs in a fresh interpreter so every round measures a cold start.
+PROBE = """
+import json, time
+start = time.perf_counter()
+import website
+imported = time.perf_counter()
+app = website.create_app()
+built = time.perf_counter()
+print(json.dumps({"import": imported - start, "factory": built - imported}))
+"""
+
+
+def run_probe():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # Self time per top-level package, from lines like
+    # "import time:       412 |       1530 |   flask.app".
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+
+    return timings, packages
+
+
+def benchmark(rounds: int, top: int):
+    imports, factories = [], []
+    packages = Counter()
+
+    for _ in range(rounds):
+        timings, round_packages = run_probe()
+        imports.append(timings["import"])
+        factories.append(timings["factory"])
+        packages.update(round_packages)
+
+    print(f"{rounds} cold starts")
+    print(f"  import website: {statistics.median(imports) * 1000:8.1f} ms median")
+    print(f"  create_app():   {statistics.median(factories) * 1000:8.1f} ms median")
+    print(f"  slowest packages (self time, mean of {rounds}):")
+    for name, total_us in packages.most_common(top):
+        print(f"    {name:<24} {total_us / rounds / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark application startup.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    benchmark(args.rounds, args.top)
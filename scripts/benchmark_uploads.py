@@ -0,0 +1,51 @@
+import argparse
+import time
+import uuid
+
+from website.application.services.upload_service import UploadService
+
+
+class FakeUploader:
+    """Stands in for Cloudinary, adding a fixed round-trip latency per call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def upload(self, file, folder, timeout):
+        time.sleep(self.latency)
+        return f"https://example.invalid/{folder}/{file}", f"{folder}/{uuid.uuid4().hex}"
+
+    def destroy(self, public_id):
+        time.sleep(self.latency)
+
+
+def benchmark(files: int, latency: float, rounds: int):
+    uploader = FakeUploader(latency)
+    pipeline = UploadService(uploader)
+    names = [f"image-{i}.png" for i in range(files)]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            uploader.upload(name, "posts", pipeline.timeout)
+    serial = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        pipeline.upload_all(names, folder="posts")
+    concurrent = (time.perf_counter() - start) / rounds
+
+    print(f"{files} files, {latency * 1000:.0f} ms per upload, {rounds} rounds")
+    print(f"  serial:     {serial * 1000:8.1f} ms per request")
+    print(f"  concurrent: {concurrent * 1000:8.1f} ms per request")
+    print(f"  speedup:    {serial / concurrent:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the image upload pipeline.")
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    benchmark(args.files, args.latency, args.rounds)
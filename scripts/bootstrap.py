@@ -0,0 +1,124 @@
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+from website import create_app, db
+from website.domain.models import Post, RatingRollup
+from website.domain.models.post import SEARCH_DOCUMENT
+from website.infrastructure.repositories import RatingRollupRepository
+from scripts.create_admin import create_admin_if_not_exists
+
+load_dotenv()
+
+
+def _on_delete(table: str, column: str, target: str, action: str) -> str:
+    """Re-creates the foreign key of `column` unless it already has `action`."""
+
+    code = {"CASCADE": "c", "SET NULL": "n"}[action]
+    return f"""
+DO $$
+DECLARE
+    fk record;
+BEGIN
+    SELECT c.conname, c.confdeltype INTO fk
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    WHERE c.contype = 'f' AND c.conrelid = '{table}'::regclass
+      AND a.attname = '{column}';
+    IF fk.conname IS NOT NULL AND fk.confdeltype <> '{code}' THEN
+        EXECUTE 'ALTER TABLE {table} DROP CONSTRAINT ' || quote_ident(fk.conname);
+        ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey
+            FOREIGN KEY ({column}) REFERENCES {target} ON DELETE {action};
+    END IF;
+END $$"""
+
+
+# create_all only creates missing tables, so columns and indexes added to
+# existing tables are listed here. Every statement must be idempotent.
+SCHEMA_UPGRADES = [
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_html TEXT",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS excerpt_html TEXT",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_html_version VARCHAR(16)",
+    "CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_saved_posts_user_id_saved_at "
+    "ON saved_posts (user_id, saved_at, post_id)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_post_id_created_at_id "
+    "ON comments (post_id, created_at, id)",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_posts_search_vector "
+    "ON posts USING gin (search_vector)",
+    # Set-based deletes rely on the database to remove dependent rows, and
+    # every cascading foreign key needs an index to find them.
+    _on_delete("comments", "post_id", "posts (id)", "CASCADE"),
+    _on_delete("comments", "parent_comment_id", "comments (id)", "CASCADE"),
+    _on_delete("comments", "reply_to_comment_id", "comments (id)", "SET NULL"),
+    _on_delete("saved_posts", "post_id", "posts (id)", "CASCADE"),
+    _on_delete("post_images", "image_id", "images (id)", "CASCADE"),
+    "CREATE INDEX IF NOT EXISTS ix_comments_author_id ON comments (author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_parent_comment_id "
+    "ON comments (parent_comment_id)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_reply_to_comment_id "
+    "ON comments (reply_to_comment_id)",
+    "CREATE INDEX IF NOT EXISTS ix_posts_author_id ON posts (author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_saved_posts_post_id ON saved_posts (post_id)",
+    "CREATE INDEX IF NOT EXISTS ix_post_images_image_id ON post_images (image_id)",
+    "CREATE INDEX IF NOT EXISTS ix_images_author_id ON images (author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_verification_codes_user_id "
+    "ON verification_codes (user_id)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS disabled_at TIMESTAMP",
+    "CREATE INDEX IF NOT EXISTS ix_verification_codes_expires_at "
+    "ON verification_codes (expires_at)",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner VARCHAR(100)",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP",
+]
+
+
+def create_database_if_not_exists():
+    """Creates the target database through the maintenance 'postgres' database."""
+
+    engine = create_engine(
+        f"postgresql+psycopg2://{os.getenv('DB_LOGIN')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_SERVER')}:{os.getenv('DB_PORT', '5432')}/postgres"
+        f"?sslmode={os.getenv('DB_SSLMODE', 'require')}",
+        isolation_level="AUTOCOMMIT",
+    )
+    db_name = os.getenv("DB_NAME")
+    try:
+        with engine.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :db_name"),
+                {"db_name": db_name},
+            ).scalar()
+            if not exists:
+                quoted = conn.dialect.identifier_preparer.quote(db_name)
+                conn.execute(text(f"CREATE DATABASE {quoted}"))
+                print(f"Database {db_name} was created.")
+    except Exception as e:
+        # Managed hosts (e.g. Render) may refuse access to 'postgres'; the
+        # database is expected to exist already in that case.
+        print(f"Error creating database: {str(e)}")
+    finally:
+        engine.dispose()
+
+
+def create_schema():
+    db.create_all()
+    if db.engine.dialect.name == "postgresql":
+        with db.engine.begin() as conn:
+            for statement in SCHEMA_UPGRADES:
+                conn.execute(text(statement))
+    # Rollups are kept up to date by writes; seed them once for existing posts.
+    if db.session.query(Post.id).first() and not RatingRollup.query.first():
+        RatingRollupRepository.rebuild()
+    print("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    create_database_if_not_exists()
+    app = create_app(run_scheduler=False)
+
+    with app.app_context():
+        create_schema()
+        create_admin_if_not_exists()
@@ -1,10 +1,10 @@
 import os
 
 from dotenv import load_dotenv
-from werkzeug.security import generate_password_hash
 
 from website import create_app, db
 from website.domain.models import User, UserRole
+from website.infrastructure.hashing import hash_password
 
 load_dotenv()
 
@@ -26,7 +26,7 @@ def create_admin_if_not_exists():
             new_admin = User(
                 username=admin_username,
                 email=admin_email,
-                password_hash=generate_password_hash(admin_password),
+                password_hash=hash_password(admin_password),
                 role=UserRole.ADMIN,
             )
             db.session.add(new_admin)
@@ -39,7 +39,7 @@ def create_admin_if_not_exists():
 
 
 if __name__ == "__main__":
-    app = create_app()
+    app = create_app(run_scheduler=False)
 
     with app.app_context():
         create_admin_if_not_exists()
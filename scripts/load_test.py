@@ -0,0 +1,122 @@
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Entrypoints compared by --compare; both listen on the same address in turn.
+SERVERS = {
+    "dev server (main.py)": [sys.executable, "main.py"],
+    "gunicorn (wsgi.py)": ["gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+}
+
+
+def fetch(url: str) -> float:
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def load(base_url: str, paths, concurrency: int, duration: float):
+    """Requests the paths round-robin from `concurrency` threads."""
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset: int):
+        i = offset
+        while time.perf_counter() < deadline:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            try:
+                elapsed = fetch(url)
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for offset in range(concurrency):
+            pool.submit(client, offset)
+    return latencies, errors, time.perf_counter() - started
+
+
+def report(name: str, latencies, errors, elapsed: float):
+    print(name)
+    if not latencies:
+        print(f"  no successful requests, {len(errors)} errors")
+        return
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"  {len(latencies) / elapsed:8.1f} requests/s ({len(errors)} errors)")
+    print(
+        f"  latency p50 {cuts[49] * 1000:.1f} ms, p95 {cuts[94] * 1000:.1f} ms, "
+        f"p99 {cuts[98] * 1000:.1f} ms"
+    )
+
+
+def wait_until_up(base_url: str, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            fetch(base_url + "/")
+            return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    raise RuntimeError(f"The server at {base_url} did not start.")
+
+
+def compare(base_url: str, paths, concurrency: int, duration: float):
+    host_port = base_url.split("://", 1)[1]
+    for name, command in SERVERS.items():
+        server = subprocess.Popen(
+            command,
+            env={
+                **os.environ,
+                "GUNICORN_BIND": host_port,
+                "PORT": host_port.rsplit(":", 1)[1],
+            },
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # The dev server's reloader forks a child; stop the whole group.
+            start_new_session=True,
+        )
+        try:
+            wait_until_up(base_url)
+            fetch(base_url + paths[0])
+            report(name, *load(base_url, paths, concurrency, duration))
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and latency of the running site."
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="start main.py and then gunicorn on --url and load each in turn",
+    )
+    args = parser.parse_args()
+    paths = args.paths or ["/", "/leaderboard", "/leaderboard/categories"]
+
+    if args.compare:
+        compare(args.url, paths, args.concurrency, args.duration)
+    else:
+        report(args.url, *load(args.url, paths, args.concurrency, args.duration))
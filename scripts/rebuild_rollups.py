@@ -0,0 +1,16 @@
+from website import create_app
+from website.infrastructure.repositories import RatingRollupRepository
+
+
+def rebuild_rollups():
+    """Recomputes the rating rollups from scratch, e.g. after a bulk import."""
+
+    count = RatingRollupRepository.rebuild()
+    print(f"Rebuilt rating rollups from {count} posts.")
+
+
+if __name__ == "__main__":
+    app = create_app(run_scheduler=False)
+
+    with app.app_context():
+        rebuild_rollups()
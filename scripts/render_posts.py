@@ -0,0 +1,48 @@
+from sqlalchemy import or_
+
+from website import create_app, db
+from website.domain.models import Post
+from website.extensions import markdown_render_version
+
+BATCH_SIZE = 200
+
+
+def render_stale_posts():
+    """Re-renders every post whose stored HTML predates the current renderer config."""
+
+    last_id = 0
+    rendered = 0
+    while True:
+        posts = (
+            Post.query.filter(
+                Post.id > last_id,
+                or_(
+                    Post.content_html_version.is_(None),
+                    Post.content_html_version != markdown_render_version(),
+                ),
+            )
+            .order_by(Post.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not posts:
+            break
+
+        for post in posts:
+            post.render_content()
+        db.session.commit()
+
+        rendered += len(posts)
+        last_id = posts[-1].id
+        print(f"Rendered {rendered} posts...")
+
+    print(
+        f"Rendering finished, {rendered} posts updated to {markdown_render_version()}."
+    )
+
+
+if __name__ == "__main__":
+    app = create_app(run_scheduler=False)
+
+    with app.app_context():
+        render_stale_posts()
@@ -0,0 +1,29 @@
+import time
+
+from website import create_app, db
+from website.application.services import OutboxService
+from website.config import Config
+
+
+def run_worker():
+    """Drains the outbox forever; run with OUTBOX_WORKER=external on the web nodes."""
+
+    outbox_service = OutboxService()
+    print("Outbox worker started.")
+
+    while True:
+        try:
+            handled = outbox_service.drain_all()
+            if handled:
+                print(f"Delivered or rescheduled {handled} outbox messages.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error draining outbox:\n\n{e}")
+        time.sleep(Config.OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    app = create_app(run_scheduler=False)
+
+    with app.app_context():
+        run_worker()
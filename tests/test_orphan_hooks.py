@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import event
+
+from website.config import Config
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", "sqlite://")
+
+    from website import create_app, db
+    from website.domain.models import Tag, User
+
+    app = create_app(run_scheduler=False)
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[User.__table__, Tag.__table__])
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def statements(app):
+    from website import db
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_flush_without_deletes_runs_no_orphan_queries(app, statements):
+    from website import db
+    from website.domain.models import Tag, User
+
+    user = User(username="reader", email="reader@example.com")
+    db.session.add(user)
+    db.session.flush()
+    statements.clear()
+
+    user.username = "renamed"
+    db.session.add(Tag(name="rpg"))
+    db.session.flush()
+
+    # Only the writes themselves; no lookups for orphaned images or comments.
+    assert sorted(" ".join(statement.split()[:3]) for statement in statements) == [
+        "INSERT INTO tags",
+        "UPDATE users SET",
+    ]
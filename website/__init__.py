@@ -1,7 +1,7 @@
 import os
 from flask import Flask
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from werkzeug.middleware.proxy_fix import ProxyFix
 from website.config import DevelopmentConfig, ProductionConfig
 from website.utils import timesince
 from website.extensions import (
@@ -10,9 +10,10 @@ from website.extensions import (
     mail,
     limiter,
     schedule_jobs,
-    oauth,
     init_markdown,
 )
+from website.infrastructure.database import init_engine_options
+from website.presentation.middlewares import init_request_timing
 from website.presentation.routes import (
     register_blueprints,
 )
@@ -22,33 +23,9 @@ from website.errors import (
 
 load_dotenv(override=True)
 
-def create_database_if_not_exists():
-    # Connect to the default 'postgres' database to check/create the target database
-    engine = create_engine(
-        f"postgresql+psycopg2://{os.getenv('DB_LOGIN')}:{os.getenv('DB_PASSWORD')}"
-        f"@{os.getenv('DB_SERVER')}:{os.getenv('DB_PORT', '5432')}/postgres"
-        f"?sslmode=require",
-        isolation_level="AUTOCOMMIT"
-    )
-    try:
-        with engine.connect() as conn:
-            # Use a DO block to conditionally create the database
-            conn.execute(text("""
-                DO $$ 
-                BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM pg_database WHERE datname = :db_name) THEN
-                        PERFORM 'CREATE DATABASE ' || quote_ident(:db_name);
-                    END IF;
-                END $$;
-            """), {"db_name": os.getenv('DB_NAME')})
-    except Exception as e:
-        print(f"Error creating database: {str(e)}")
-        # If database creation fails (e.g., Render restricts access), proceed to table creation
-        # This assumes the database already exists
-
-def create_app():
+def create_app(run_scheduler: bool = True):
+    """Builds the app; scripts pass run_scheduler=False to skip background jobs."""
 
-    create_database_if_not_exists()
     app = Flask(
         __name__,
         static_folder="presentation/static",
@@ -63,22 +40,23 @@ def create_app():
     else:
         app.config.from_object(DevelopmentConfig)
 
+    proxies = app.config["PROXY_COUNT"]
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+
+    init_engine_options(app)
     db.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = "auth.login"
     login_manager.login_message_category = "danger"
     mail.init_app(app)
     limiter.init_app(app)
-    oauth.init_app(app)
     init_markdown(app)
+    init_request_timing(app)
 
     register_blueprints(app)
     register_error_handlers(app)
-    with app.app_context():
-        from website.domain import models
-
-        db.create_all()
-
-    schedule_jobs(app)
+    if run_scheduler:
+        schedule_jobs(app)
 
     return app
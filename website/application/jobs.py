@@ -0,0 +1,32 @@
+"""Periodic jobs. Only the scheduler leader runs them (see SCHEDULER_MODE).
+
+A job may return the number of rows or messages it handled; the count is
+shown with its timings on the performance page.
+"""
+
+from website.config import Config
+from website.infrastructure.scheduling import periodic
+
+
+@periodic(seconds=Config.VERIFICATION_PURGE_SECONDS)
+def purge_expired_codes():
+    from website.application.services import AuthService
+
+    return AuthService().purge_expired_codes()
+
+
+@periodic(
+    seconds=Config.OUTBOX_POLL_SECONDS,
+    enabled=lambda config: config["OUTBOX_WORKER"] == "scheduler",
+)
+def drain_outbox():
+    from website.application.services import OutboxService
+
+    return OutboxService().drain_all()
+
+
+@periodic(seconds=Config.JOB_RESUME_SECONDS)
+def resume_stale_jobs():
+    from website.application.services import PurgeService
+
+    return PurgeService().resume_stale()
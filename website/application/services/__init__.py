@@ -4,5 +4,8 @@ from .admin_service import AdminService
 from .public_service import PublicService
 from .settings_service import SettingsService
 
+from .upload_service import UploadService
 from .post_service import PostService
 from .comment_service import CommentService
+from .outbox_service import OutboxService
+from .purge_service import PurgeService
@@ -1,38 +1,167 @@
-import os
-from typing import Any, Dict, List, Tuple
+import gzip
+import io
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import cloudinary.uploader
-from flask import current_app
-from sqlalchemy import text, Table, MetaData
+from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.datastructures import FileStorage
 
 from website import db
 from website.config import Config
-from website.domain.models import UserRole
-from website.infrastructure.repositories.table_repository import TableRepository
+from website.domain.models import ContentRevision, Job, UserRole
+from website.infrastructure.backup import (
+    CHUNK_BYTES,
+    BackupFormatError,
+    backup_chunks,
+    restore,
+)
+from website.infrastructure.database import pool_statistics
+from website.infrastructure.metrics import SEGMENTS, endpoint_stats, job_stats
+from website.infrastructure.page_cache import page_cache
+from website.infrastructure.scheduling import leader
+from website.infrastructure.user_cache import user_cache
+from website.infrastructure.repositories import ContentRevisionRepository, JobRepository
+from website.infrastructure.repositories.pagination import StreamedPage, decode_key
+from website.infrastructure.repositories.table_repository import (
+    FILTER_OPERATORS,
+    TableRepository,
+)
+from website.infrastructure.table_export import FORMATS as EXPORT_FORMATS
+from website.infrastructure.table_export import export_chunks
+from .purge_service import PurgeService
 
 
 class AdminService:
     def __init__(self) -> None:
         self.table_repository = TableRepository()
+        self.purge_service = PurgeService()
 
     def list_tables(self) -> List[str]:
         return self.table_repository.all_tables()
 
-    def get_records(self, table_name: str) -> Tuple[List[Dict[str, Any]], List[str]]:
-        if not table_name or not table_name.isidentifier():
-            return [], []
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        return pool_statistics(db.engine)
+
+    def get_page_cache_statistics(self) -> Dict[str, Any]:
+        return page_cache.statistics()
+
+    def get_user_cache_statistics(self) -> Dict[str, Any]:
+        return user_cache.statistics()
+
+    def get_scheduler_statistics(self) -> Dict[str, Any]:
+        return {
+            "mode": Config.SCHEDULER_MODE,
+            "leader": leader.is_leader,
+            "since": leader.since,
+            "jobs": job_stats.summary(),
+        }
+
+    def get_performance_summary(self) -> Tuple[List[Dict[str, Any]], Tuple[str, ...]]:
+        return endpoint_stats.summary(), SEGMENTS
+
+    def get_records(
+        self,
+        table_name: str,
+        columns: Sequence[str] = (),
+        filters: Sequence[Tuple[str, str, str]] = (),
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """One page of a table for the database viewer, and an error if any.
+
+        Only the chosen columns (plus the primary key) are selected, and the
+        rows are streamed to the template instead of being loaded up front.
+        """
+
+        empty = {
+            "attributes": [],
+            "columns": [],
+            "filters": [],
+            "records": StreamedPage(iter(()), [], 0),
+        }
+        try:
+            table = self.table_repository.reflect(table_name)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"Error reflecting table {table_name}: {str(e)}")
+            return empty, f"Table '{table_name}' could not be read."
+        if table is None:
+            return empty, None
+
+        all_columns = [column.name for column in table.columns]
+        key_columns = [column.name for column in table.primary_key.columns]
+        attributes = [
+            name
+            for name in all_columns
+            if not columns or name in columns or name in key_columns
+        ]
+        filters = [
+            (name, operator, value)
+            for name, operator, value in filters
+            if name in all_columns
+            and operator in FILTER_OPERATORS
+            and (value or operator == "empty")
+        ]
+        page_size = min(
+            max(page_size or Config.ADMIN_ROWS_PER_PAGE, 1),
+            Config.ADMIN_MAX_ROWS_PER_PAGE,
+        )
+        context = {
+            "attributes": attributes,
+            "columns": all_columns,
+            "filters": filters,
+            "page_size": page_size,
+            "deletable": key_columns == ["id"]
+            and table_name not in ("post_images", "post_tags", "saved_posts"),
+        }
 
         try:
-            metadata = MetaData()
-            table = Table(table_name, metadata, autoload_with=db.engine)
-            column_names = [column.name for column in table.columns]
-            records = db.session.execute(table.select()).mappings().all()
-            record_list = [dict(row) for row in records]
-            return record_list, column_names
-        except Exception as e:
+            statement = self.table_repository.select_page(
+                table,
+                attributes,
+                filters,
+                page_size,
+                decode_key(cursor, len(key_columns)),
+            )
+            rows = self.table_repository.stream(statement)
+        except (ValueError, ArithmeticError):
+            context["records"] = StreamedPage(iter(()), key_columns, page_size)
+            return context, "A filter value does not match its column."
+        except SQLAlchemyError as e:
+            db.session.rollback()
             print(f"Error fetching records for table {table_name}: {str(e)}")
-            return [], []
+            context["records"] = StreamedPage(iter(()), key_columns, page_size)
+            return context, "The filters could not be applied."
+
+        context["records"] = StreamedPage(rows, key_columns, page_size)
+        return context, None
+
+    def export_table(
+        self, table_name: str, fmt: str, compress: bool = False
+    ) -> Tuple[bool, str, Optional[Iterator[bytes]]]:
+        """Streams every row of a table as CSV or JSON lines, optionally gzipped.
+
+        Rows are read through a server-side cursor and encoded in chunks, so
+        memory use does not grow with the size of the table.
+        """
+
+        if fmt not in EXPORT_FORMATS:
+            return False, f"Unknown export format '{fmt}'.", None
+
+        try:
+            table = self.table_repository.reflect(table_name)
+            if table is None:
+                return False, f"Table '{table_name}' not found.", None
+            rows = self.table_repository.stream(
+                self.table_repository.select_all(table),
+                batch_size=Config.EXPORT_BATCH_SIZE,
+            )
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"Error exporting table {table_name}: {str(e)}")
+            return False, f"Table '{table_name}' could not be read.", None
+
+        columns = [column.name for column in table.columns]
+        return True, "", export_chunks(fmt, columns, rows, compress)
 
     def delete_one(self, table_name: str, record_id: int) -> Tuple[bool, str, int]:
         forbidden_tables = ("post_tags", "saved_posts")
@@ -50,85 +179,54 @@ class AdminService:
         if table_name == "users" and getattr(entity, "role", None) == UserRole.ADMIN:
             return False, "Cannot delete admin user.", 403
 
-        for attr_name in ("public_id", "avatar_public_id"):
-            cloudinary_id = getattr(entity, attr_name, None)
-            if cloudinary_id:
-                try:
-                    cloudinary.uploader.destroy(cloudinary_id, invalidate=True)
-                except Exception:
-                    return False, "Failed to destroy image.", 500
-
-        related_images = getattr(entity, "images", None)
-        if related_images:
-            for image in related_images:
-                image_public_id = getattr(image, "public_id", None)
-                if image_public_id:
-                    try:
-                        cloudinary.uploader.destroy(image_public_id, invalidate=True)
-                    except Exception:
-                        return False, "Failed to destroy related post image.", 500
-
-        self.table_repository.delete(entity)
+        ContentRevisionRepository.bump(ContentRevision.SITE)
+        if "id" in entity.__table__.c:
+            PurgeService.delete_ids(table_name, [record_id])
+            db.session.commit()
+        else:
+            self.table_repository.delete(entity)
+        if table_name == "users":
+            user_cache.invalidate(record_id)
         return True, f"Record {record_id} deleted from {table_name}.", 200
 
-    def delete_all(self, table_name: str) -> Tuple[bool, str, int, int]:
-        table_query = self.table_repository.query_for(table_name)
-        if not table_query:
-            return False, f"Table '{table_name}' not found.", 404, 0
+    def delete_all(self, table_name: str) -> Tuple[bool, str, int, Optional[Job]]:
+        """Starts deleting every record in the background; returns the job."""
 
-        if table_name == "users":
-            from website.domain.models.user import User
-
-            table_query = table_query.filter(User.role != UserRole.ADMIN)
-
-        entities_to_delete = table_query.all()
-        for entity in entities_to_delete:
-            for attr_name in ("public_id", "avatar_public_id"):
-                cloudinary_id = getattr(entity, attr_name, None)
-                if cloudinary_id:
-                    try:
-                        cloudinary.uploader.destroy(cloudinary_id, invalidate=True)
-                    except Exception:
-                        return False, "Failed to destroy image.", 500, 0
-
-            related_images = getattr(entity, "images", None)
-            if related_images:
-                for image in related_images:
-                    image_public_id = getattr(image, "public_id", None)
-                    if image_public_id:
-                        try:
-                            cloudinary.uploader.destroy(
-                                image_public_id, invalidate=True
-                            )
-                        except Exception:
-                            return (
-                                False,
-                                "Failed to destroy related post image.",
-                                500,
-                                0,
-                            )
-
-        deleted_count = self.table_repository.bulk_delete(table_query)
-        return True, f"Deleted {deleted_count} records.", 200, deleted_count
-
-    def download_database(self) -> str:
-        database_path = os.path.join(
-            current_app.root_path,
-            "..",
-            "instance",
-            Config.DB_NAME,
-        )
-        return os.path.abspath(database_path)
+        success, message, job = self.purge_service.start(table_name)
+        return success, message, 202 if success else 404, job
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        job = JobRepository.get(job_id)
+        return job.progress() if job else None
+
+    def backup_database(self) -> Iterator[bytes]:
+        """Streams a gzipped COPY backup of every table in a single snapshot."""
+
+        return backup_chunks(db.engine, self.table_repository.sorted_tables())
 
     def restore_database(self, backup_file: FileStorage) -> Tuple[bool, str]:
-        if not backup_file or not backup_file.filename.endswith(".db"):
-            return False, "Invalid file. Must be .db"
-
-        target_path = os.path.join(
-            current_app.root_path,
-            "..",
-            "instance",
-            Config.DB_NAME,
-        )
-        backup_file.save(target_path)
-        return True, "Database restored successfully."
+        if not backup_file or not backup_file.filename.endswith(".gz"):
+            return False, "Invalid file. Must be a .gz backup"
+
+        # TRUNCATE waits for every open transaction on the tables, including
+        # the one this request used to load the admin.
+        db.session.rollback()
+        try:
+            with gzip.open(backup_file.stream, "rb") as source:
+                counts = restore(
+                    db.engine,
+                    io.BufferedReader(source, CHUNK_BYTES),
+                    self.table_repository.sorted_tables(),
+                )
+        except (BackupFormatError, OSError, EOFError) as e:
+            return False, f"Invalid backup: {str(e)}"
+        except Exception as e:
+            # Nothing was changed: the restore runs in a single transaction.
+            print(f"Error restoring database: {str(e)}")
+            return False, "The backup could not be restored."
+
+        self.table_repository.forget_reflection()
+        user_cache.clear()
+        ContentRevisionRepository.bump(ContentRevision.SITE)
+        db.session.commit()
+        return True, f"Database restored: {sum(counts.values())} rows."
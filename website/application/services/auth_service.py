@@ -1,15 +1,26 @@
 import random
+import time
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.exc import OperationalError
 from flask import request, render_template
 from flask_login import login_user, logout_user
 
+from website import db
+from website.config import Config
 from website.infrastructure.repositories import (
+    OutboxRepository,
     UserRepository,
     VerificationCodeRepository,
 )
 from website.domain.models import User, VerificationCode
-from website.extensions import google
+from website.extensions import get_google
+from website.infrastructure.hashing import (
+    hash_password,
+    needs_rehash,
+    verify_code,
+    verify_password,
+)
+from website.infrastructure.metrics import timed
 from website.utils import generate_username
 
 
@@ -21,7 +32,7 @@ class AuthService:
         user = User(
             username=generate_username(),
             email=form.email.data,
-            password_hash=generate_password_hash(form.password.data),
+            password_hash=hash_password(form.password.data),
         )
 
         UserRepository.save(user)
@@ -34,10 +45,12 @@ class AuthService:
 
         if (
             user
+            and user.is_active
             and user.email != admin_email
             and user.password_hash
-            and check_password_hash(user.password_hash, form.password.data)
+            and verify_password(user.password_hash, form.password.data)
         ):
+            self._upgrade_hash(user, form.password.data)
             login_user(user)
             return True, f"Welcome back, {user.username}!"
 
@@ -48,14 +61,19 @@ class AuthService:
         return "You have been logged out."
 
     def google_authorize(self, preferred_url_scheme: str) -> tuple[None, str]:
-        token = google.authorize_access_token()
-        info = google.get(
-            "https://openidconnect.googleapis.com/v1/userinfo", token=token
-        ).json()
+        google = get_google()
+        with timed("google"):
+            token = google.authorize_access_token()
+            info = google.get(
+                "https://openidconnect.googleapis.com/v1/userinfo", token=token
+            ).json()
         email = info["email"]
 
         user = UserRepository.get_by_email(email)
 
+        if user and not user.is_active:
+            return False, "This account is being deleted."
+
         if user:
             user.google_id = info["sub"]
             user.avatar_url = user.avatar_url or info.get("picture")
@@ -81,12 +99,16 @@ class AuthService:
     def send_reset_code(self, form, admin_email: str) -> tuple[bool, str]:
         user = UserRepository.get_by_email(form.email.data)
 
-        if not user or user.email == admin_email or not user.password_hash:
+        if (
+            not user
+            or not user.is_active
+            or user.email == admin_email
+            or not user.password_hash
+        ):
             return False, "Invalid credentials. Please try again."
 
         code = str(random.randint(1000, 9999))
         verification_code = VerificationCode(user.id, code)
-        VerificationCodeRepository.create(verification_code)
 
         verification_link = (
             f"{request.host_url}auth/verify-code?token={verification_code.token}"
@@ -97,25 +119,17 @@ class AuthService:
             verification_link=verification_link,
             theme="system",
         )
+        OutboxRepository.enqueue_email(
+            to=user.email, subject="Password Reset Code", html_body=html
+        )
+        VerificationCodeRepository.create(verification_code)
 
-        from .mailjet_service import MailjetService
-
-        mailjet = MailjetService()
-
-        try:
-            mailjet.send_email(
-                to=user.email, subject="Password Reset Code", html_body=html
-            )
-            return True, verification_code.token
-        except Exception as e:
-            return False, str(e)
+        return True, verification_code.token
 
     def verify_code(self, token: str, code: str) -> bool:
         verification_code = VerificationCodeRepository.get_by_token(token)
-        if (
-            verification_code
-            and not verification_code.is_expired()
-            and check_password_hash(verification_code.code_hash, code)
+        if verification_code and verify_code(
+            verification_code.code_hash, token, code
         ):
             VerificationCodeRepository.invalidate(verification_code)
             return True
@@ -124,22 +138,62 @@ class AuthService:
 
     def reset_password(self, token: str, new_password: str) -> tuple[bool, str]:
         verification_code = VerificationCodeRepository.get_by_token(token)
-        if not verification_code or verification_code.is_expired():
+        if not verification_code or not verification_code.is_valid:
             return False, "The verification link is invalid or expired."
 
         user = UserRepository.get_by_id(verification_code.user_id)
-        user.password_hash = generate_password_hash(new_password)
+        user.password_hash = hash_password(new_password)
         UserRepository.save(user)
 
-        VerificationCodeRepository.invalidate(verification_code)
+        # A reset link works once.
+        VerificationCodeRepository.consume(verification_code)
 
         return True, "Password reset successfully."
 
+    def purge_expired_codes(self) -> int:
+        """Deletes expired codes in bounded batches and returns how many.
+
+        Reads already ignore expired codes, so this only reclaims space. It
+        stops after VERIFICATION_PURGE_MAX_BATCHES and pauses between
+        batches, pausing longer after lock or statement timeouts.
+        """
+
+        batch_size = Config.VERIFICATION_PURGE_BATCH_SIZE
+        pause = Config.VERIFICATION_PURGE_PAUSE_SECONDS
+        purged = 0
+        for _ in range(Config.VERIFICATION_PURGE_MAX_BATCHES):
+            try:
+                deleted = VerificationCodeRepository.delete_expired(batch_size)
+                db.session.commit()
+            except OperationalError as e:
+                db.session.rollback()
+                print(f"Error deleting expired verification codes: {str(e)}")
+                pause = min(pause * 2, Config.VERIFICATION_PURGE_MAX_PAUSE_SECONDS)
+                time.sleep(pause)
+                continue
+
+            purged += deleted
+            if deleted < batch_size:
+                break
+            time.sleep(pause)
+        return purged
+
     def admin_login(self, form, admin_email: str) -> tuple[bool, str]:
         admin = UserRepository.get_by_email(admin_email)
 
-        if admin and check_password_hash(admin.password_hash, form.password.data):
+        if admin and verify_password(admin.password_hash, form.password.data):
+            self._upgrade_hash(admin, form.password.data)
             login_user(admin)
             return True, "Welcome back, boss!"
 
         return False, "Invalid admin credentials."
+
+    @staticmethod
+    def _upgrade_hash(user: User, password: str) -> None:
+        """Re-hashes with the configured method; login is the only time the
+        password is known.
+        """
+
+        if needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+            UserRepository.save(user)
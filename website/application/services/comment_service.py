@@ -1,7 +1,12 @@
 from typing import List, Optional, Tuple
 
-from website.domain.models import Comment, UserRole
-from website.infrastructure.repositories import CommentRepository
+from website.config import Config
+from website.domain.models import Comment, ContentRevision, UserRole
+from website.infrastructure.repositories import (
+    CommentRepository,
+    ContentRevisionRepository,
+)
+from website.infrastructure.repositories.comment_repository import CommentNode
 
 from website import db
 
@@ -33,6 +38,7 @@ class CommentService:
             parent_comment_id=thread_parent,
             reply_to_comment_id=reply_to,
         )
+        ContentRevisionRepository.bump(ContentRevision.post(post_id))
         CommentRepository.add(comment)
         return True, (
             "Reply posted successfully."
@@ -52,6 +58,7 @@ class CommentService:
             return False, "Comment cannot be empty."
 
         comment.content = new_content.strip()
+        ContentRevisionRepository.bump(ContentRevision.post(comment.post_id))
         db.session.commit()
         return True, "Comment edited successfully."
 
@@ -64,10 +71,17 @@ class CommentService:
         if comment.author_id != user_id and user_role != UserRole.ADMIN:
             return False, "Not authorized to delete."
 
+        ContentRevisionRepository.bump(ContentRevision.post(comment.post_id))
         CommentRepository.delete(comment)
         return True, "Comment deleted successfully."
 
-    def list_comments(self, post_id: int, sort: str = "oldest") -> List[Comment]:
-        if sort == "newest":
-            return CommentRepository.list_by_post(post_id, order="desc")
-        return CommentRepository.list_by_post(post_id, order="asc")
+    def count_comments(self, post_id: int) -> int:
+        return CommentRepository.count_by_post(post_id)
+
+    def list_comments(
+        self, post_id: int, sort: str = "oldest", cursor: Optional[str] = None
+    ) -> Tuple[List[CommentNode], Optional[str]]:
+        order = "desc" if sort == "newest" else "asc"
+        return CommentRepository.list_threads(
+            post_id, Config.COMMENTS_PER_PAGE, cursor, order=order
+        )
@@ -1,6 +1,7 @@
 from mailjet_rest import Client
 
 from website.config import Config
+from website.infrastructure.metrics import timed
 
 
 class MailjetService:
@@ -20,4 +21,5 @@ class MailjetService:
                 }
             ]
         }
-        return self.client.send.create(data=data)
+        with timed("mailjet"):
+            return self.client.send.create(data=data)
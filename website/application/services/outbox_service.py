@@ -0,0 +1,78 @@
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from website import db
+from website.config import Config
+from website.domain.models import OutboxMessage
+from website.extensions import get_cloudinary_api, get_cloudinary_uploader
+from website.infrastructure.repositories import JobRepository, OutboxRepository
+
+
+def _send_email(payload: dict) -> None:
+    from .mailjet_service import MailjetService
+
+    response = MailjetService().send_email(
+        to=payload["to"],
+        subject=payload["subject"],
+        html_body=payload["html_body"],
+    )
+    if response.status_code >= 400:
+        raise RuntimeError(f"Mailjet responded {response.status_code}")
+
+
+def _destroy_image(payload: dict) -> None:
+    get_cloudinary_uploader().destroy(payload["public_id"], invalidate=True)
+
+
+def _destroy_images(payload: dict) -> None:
+    public_ids = payload["public_ids"]
+    get_cloudinary_api().delete_resources(public_ids, invalidate=True)
+    if payload.get("job_id"):
+        JobRepository.add_destroyed_assets(payload["job_id"], len(public_ids))
+
+
+class OutboxService:
+    """Delivers side effects that were committed together with domain changes."""
+
+    HANDLERS: Dict[str, Callable[[dict], None]] = {
+        OutboxMessage.SEND_EMAIL: _send_email,
+        OutboxMessage.DESTROY_IMAGE: _destroy_image,
+        OutboxMessage.DESTROY_IMAGES: _destroy_images,
+    }
+
+    def drain(self, batch_size: Optional[int] = None) -> int:
+        """Processes one batch of due messages and returns how many were handled."""
+
+        messages = OutboxRepository.claim_batch(batch_size or Config.OUTBOX_BATCH_SIZE)
+
+        for message in messages:
+            handler = self.HANDLERS.get(message.kind)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for outbox kind '{message.kind}'")
+                handler(message.payload)
+            except Exception as e:
+                if message.attempts + 1 >= Config.OUTBOX_MAX_ATTEMPTS:
+                    OutboxRepository.give_up(message, str(e))
+                else:
+                    OutboxRepository.retry_later(
+                        message, str(e), self._backoff(message.attempts)
+                    )
+            else:
+                OutboxRepository.complete(message)
+
+        db.session.commit()
+        return len(messages)
+
+    def drain_all(self) -> int:
+        handled = 0
+        while True:
+            count = self.drain()
+            handled += count
+            if count < Config.OUTBOX_BATCH_SIZE:
+                return handled
+
+    @staticmethod
+    def _backoff(attempts: int) -> timedelta:
+        seconds = Config.OUTBOX_RETRY_BASE_SECONDS * (2**attempts)
+        return timedelta(seconds=min(seconds, Config.OUTBOX_RETRY_MAX_SECONDS))
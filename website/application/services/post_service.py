@@ -1,22 +1,38 @@
 from typing import List, Optional, Tuple
 from werkzeug.datastructures import FileStorage
 
-import cloudinary.uploader
-
 from website import db
-from website.domain.models import Post, Image, SavedPost
+from website.config import Config
+from website.domain.models import (
+    ContentRevision,
+    Image,
+    Post,
+    RatingRollup,
+    SavedPost,
+)
 from website.infrastructure.repositories import (
+    ContentRevisionRepository,
+    RatingRollupRepository,
     PostRepository,
     ImageRepository,
+    OutboxRepository,
     SavedPostRepository,
+    TagRepository,
 )
+from website.utils import extract_hashtags
+from .upload_service import UploadError, UploadService
 
 
 class PostService:
     MAX_IMAGES = 5
 
-    def list_posts(self) -> List[Post]:
-        return PostRepository.list_all()
+    def __init__(self, upload_service: Optional[UploadService] = None) -> None:
+        self.upload_service = upload_service or UploadService()
+
+    def list_posts(
+        self, cursor: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[str]]:
+        return PostRepository.list_all(Config.POSTS_PER_PAGE, cursor)
 
     def get_post(self, post_id: int) -> Tuple[Optional[Post], str]:
         post = PostRepository.get_by_id(post_id)
@@ -67,21 +83,31 @@ class PostService:
             game_developer=game_developer,     # Added
             category=category,                 # Added
         )
+        post.render_content()
 
-        for img in images:
-            response = cloudinary.uploader.upload(
-                img, folder="posts", resource_type="image"
-            )
-            url = response.get("secure_url")
-            public_id = response.get("public_id")
-            if not url:
-                continue
+        # Nothing is pending yet: end the transaction the request's reads
+        # opened, so the connection is not held idle during the uploads.
+        db.session.commit()
+        try:
+            uploads = self.upload_service.upload_all(images, folder="posts")
+        except UploadError as e:
+            return False, str(e)
 
+        for url, public_id in uploads:
             new_img = Image(author_id=author_id, url=url, public_id=public_id)
             post.images.append(new_img)
             ImageRepository.add_image(new_img)
 
-        PostRepository.save_post(post)
+        try:
+            post.tags = TagRepository.get_or_create(extract_hashtags(content))
+            RatingRollupRepository.apply(RatingRollup.values_of(post), 1)
+            ContentRevisionRepository.bump(ContentRevision.FEED)
+            PostRepository.save_post(post)
+        except Exception as e:
+            db.session.rollback()
+            self.upload_service.discard(uploads)
+            return False, f"Error saving post: {e}"
+
         return True, "Post created successfully!"
 
     def edit_post(
@@ -106,26 +132,36 @@ class PostService:
         game_developer: str,      # Added
         category: str,            # Added
     ) -> Tuple[bool, str]:
-        for img in list(post.images):
-            if img.id in delete_ids:
-                try:
-                    cloudinary.uploader.destroy(img.public_id, invalidate=True)
-                except Exception:
-                    pass
-                post.images.remove(img)
-                db.session.delete(img)
+        rated_before = RatingRollup.values_of(post)
+        kept = [img for img in post.images if img.id not in delete_ids]
 
-        if not post.images and not new_files:
+        if not kept and not new_files:
             return False, "At least one image is required."
 
-        if len(post.images) + len(new_files) > self.MAX_IMAGES:
+        if len(kept) + len(new_files) > self.MAX_IMAGES:
             return False, f"At most {self.MAX_IMAGES} images are allowed."
 
+        # Nothing is changed before the uploads finish: end the transaction
+        # that loaded the post, so the connection is not held idle meanwhile.
+        db.session.commit()
+        try:
+            uploads = self.upload_service.upload_all(new_files, folder="posts")
+        except UploadError as e:
+            return False, str(e)
+
+        for img in list(post.images):
+            if img.id in delete_ids:
+                OutboxRepository.enqueue_image_destroy(img.public_id)
+                post.images.remove(img)
+                db.session.delete(img)
+
         if title != post.title:
             post.title = title
 
-        if content != post.content:
+        content_changed = content != post.content
+        if content_changed:
             post.content = content
+            post.render_content()
 
         if overall_rating != post.overall_rating:
             post.overall_rating = overall_rating
@@ -167,27 +203,27 @@ class PostService:
         if category != post.category:
             post.category = category
 
-        for file in new_files:
-            response = cloudinary.uploader.upload(
-                file, folder="posts", resource_type="image"
-            )
-            url = response.get("secure_url")
-            public_id = response.get("public_id")
-            if not url or not public_id:
-                continue
-
+        for url, public_id in uploads:
             new_img = Image(author_id=author_id, url=url, public_id=public_id)
             post.images.append(new_img)
             db.session.add(new_img)
 
         try:
+            if content_changed:
+                post.tags = TagRepository.get_or_create(extract_hashtags(content))
+            rated_after = RatingRollup.values_of(post)
+            if rated_after != rated_before:
+                RatingRollupRepository.apply_delta(rated_before, rated_after)
+            ContentRevisionRepository.bump(
+                ContentRevision.post(post.id), ContentRevision.FEED
+            )
             db.session.commit()
             return True, "Post edited successfully!"
         except Exception as e:
             db.session.rollback()
+            self.upload_service.discard(uploads)
             return False, f"Error saving changes: {e}"
 
-
     def toggle_save(self, post_id: int, user_id: int) -> bool:
         saved = SavedPostRepository.find(user_id, post_id)
         if saved:
@@ -196,19 +232,26 @@ class PostService:
         SavedPostRepository.add(SavedPost(user_id=user_id, post_id=post_id))
         return True
 
-    def list_saved(self, user_id: int) -> List[Post]:
-        return SavedPostRepository.list_by_user(user_id)
+    def list_saved(
+        self, user_id: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[str]]:
+        return SavedPostRepository.list_by_user(user_id, Config.POSTS_PER_PAGE, cursor)
 
     def delete_post(self, post: Post) -> Tuple[bool, str]:
+        post_id = post.id
         try:
             SavedPostRepository.remove_by_post(post.id)
 
             for img in list(post.images):
-                cloudinary.uploader.destroy(img.public_id, invalidate=True)
+                OutboxRepository.enqueue_image_destroy(img.public_id)
                 ImageRepository.delete_image(img)
 
+            RatingRollupRepository.apply(RatingRollup.values_of(post), -1)
+            ContentRevisionRepository.bump(
+                ContentRevision.post(post_id), ContentRevision.FEED
+            )
             PostRepository.delete_post(post)
-            return True, f"Post {post.id} deleted successfully."
+            return True, f"Post {post_id} deleted successfully."
         except Exception as e:
             db.session.rollback()
             return False, str(e)
@@ -1,15 +1,75 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from flask import render_template
+from markupsafe import Markup, escape
 
+from website import db
 from website.config import Config
-from website.infrastructure.repositories.post_repository import PostRepository
+from website.domain.models import RatingRollup
+from website.infrastructure.repositories import (
+    OutboxRepository,
+    RatingRollupRepository,
+)
+from website.infrastructure.repositories.post_repository import (
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    PostRepository,
+)
 
 
 class PublicService:
-    def get_home_context(self, selected_tags: List[str]) -> dict:
-        posts = PostRepository.get_posts_by_tags(selected_tags)
-        return {"posts": posts, "selected_tags": selected_tags}
+    MAX_SEARCH_LENGTH = 200
+
+    def get_home_context(
+        self, selected_tags: List[str], cursor: Optional[str] = None
+    ) -> dict:
+        posts, next_cursor = PostRepository.get_posts_by_tags(
+            selected_tags, Config.POSTS_PER_PAGE, cursor
+        )
+        return {
+            "posts": posts,
+            "selected_tags": selected_tags,
+            "next_cursor": next_cursor,
+        }
+
+    def get_leaderboard_context(self) -> dict:
+        return {
+            "games": RatingRollupRepository.top_games(
+                Config.LEADERBOARD_SIZE, Config.LEADERBOARD_MIN_POSTS
+            ),
+            "ratings": RatingRollup.RATINGS,
+        }
+
+    def get_best_in_category_context(self) -> dict:
+        return {
+            "categories": RatingRollupRepository.best_in_categories(),
+            "ratings": RatingRollup.RATINGS,
+        }
+
+    def search(self, terms: str, cursor: Optional[str] = None) -> dict:
+        terms = (terms or "").strip()[: self.MAX_SEARCH_LENGTH]
+        if not terms:
+            return {"query": "", "results": [], "next_cursor": None}
+
+        rows, next_cursor = PostRepository.search(
+            terms, Config.POSTS_PER_PAGE, cursor
+        )
+        return {
+            "query": terms,
+            "results": [
+                {"post": row.Post, "snippet": self._highlight(row.snippet)}
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def _highlight(snippet: str) -> Markup:
+        return (
+            escape(snippet or "")
+            .replace(HIGHLIGHT_START, Markup("<mark>"))
+            .replace(HIGHLIGHT_STOP, Markup("</mark>"))
+        )
 
     def send_contact(self, user, form) -> Tuple[bool, str]:
         subject = (
@@ -21,12 +81,8 @@ class PublicService:
             sender_email=user.email,
         )
 
-        from .mailjet_service import MailjetService
-
-        mailjet = MailjetService()
-
-        try:
-            mailjet.send_email(to=Config.ADMIN_EMAIL, subject=subject, html_body=html)
-            return True, "Your message has been sent successfully!"
-        except Exception as e:
-            return False, str(e)
+        OutboxRepository.enqueue_email(
+            to=Config.ADMIN_EMAIL, subject=subject, html_body=html
+        )
+        db.session.commit()
+        return True, "Your message has been sent successfully!"
@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from website import db
+from website.config import Config
+from website.domain.models import (
+    Comment,
+    ContentRevision,
+    Image,
+    Job,
+    Post,
+    SavedPost,
+    User,
+    UserRole,
+    VerificationCode,
+)
+from website.extensions import run_in_background
+from website.infrastructure.job_heartbeat import job_heartbeat
+from website.infrastructure.repositories import (
+    ContentRevisionRepository,
+    JobRepository,
+    OutboxRepository,
+    PurgeRepository,
+    RatingRollupRepository,
+    UserRepository,
+)
+from website.infrastructure.repositories.table_repository import TableRepository
+from website.infrastructure.user_cache import user_cache
+
+# Tables whose rows own Cloudinary images or cascade into tables that do.
+PURGERS: Dict[str, Callable[[Sequence[int]], List[str]]] = {
+    "users": PurgeRepository.delete_users,
+    "posts": PurgeRepository.delete_posts,
+    "images": PurgeRepository.delete_images,
+}
+# The posts that deleting rows of these tables removes, found before the
+# delete so that their ratings can be taken out of the rollups.
+REMOVED_POSTS: Dict[str, Callable[[Sequence[int]], Sequence[int]]] = {
+    "users": PurgeRepository.posts_of_users,
+    "posts": lambda ids: ids,
+    "images": PurgeRepository.posts_emptied_by_images,
+}
+
+
+class JobTakenOver(Exception):
+    """The job was given to another process while this one was running it."""
+
+
+class PurgeService:
+    """Deletes table rows in set-based batches, outside the request."""
+
+    def start(self, table_name: str) -> Tuple[bool, str, Optional[Job]]:
+        if TableRepository.model_for(table_name) is None:
+            return False, f"Table '{table_name}' not found.", None
+
+        app = current_app._get_current_object()
+        job_heartbeat.ensure_started(app)
+        job = JobRepository.create(
+            Job.PURGE_TABLE, table_name, job_heartbeat.runner_id
+        )
+        run_in_background(app, self.run, job.id)
+        return True, f"Deleting all records from {table_name}.", job
+
+    def start_account(self, user: User) -> Job:
+        """Disables the account now and removes everything it owns afterwards."""
+
+        UserRepository.disable(user)
+        app = current_app._get_current_object()
+        job_heartbeat.ensure_started(app)
+        job = JobRepository.create(
+            Job.PURGE_ACCOUNT, str(user.id), job_heartbeat.runner_id
+        )
+        user_cache.invalidate(user.id)
+        run_in_background(app, self.run, job.id)
+        return job
+
+    def resume_stale(self) -> int:
+        """Resumes jobs whose process died (a restart, a crash); returns how many.
+
+        Every step deletes by ascending id from the start, so a resumed job
+        only finds the rows that are still left and keeps its counts.
+        """
+
+        job_heartbeat.ensure_started(current_app._get_current_object())
+        cutoff = datetime.utcnow() - timedelta(seconds=Config.JOB_STALE_SECONDS)
+        resumed = 0
+        while True:
+            job = JobRepository.claim_stale(cutoff, job_heartbeat.runner_id)
+            if job is None:
+                return resumed
+            db.session.commit()
+            print(f"Resuming {job.kind} job {job.id} for {job.target}.")
+            self.run(job.id)
+            resumed += 1
+
+    def run(self, job_id: int) -> None:
+        job = JobRepository.get(job_id)
+        if (
+            job is None
+            or job.status not in (Job.QUEUED, Job.RUNNING)
+            or job.owner != job_heartbeat.runner_id
+        ):
+            return
+
+        try:
+            if job.kind == Job.PURGE_ACCOUNT:
+                self._purge_account(job)
+            else:
+                self._purge_table(job)
+            JobRepository.finish(job)
+            db.session.commit()
+        except JobTakenOver:
+            db.session.rollback()
+            print(f"{job.kind} job {job.id} was resumed by another process.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error running {job.kind} job for {job.target}: {str(e)}")
+            JobRepository.fail(job, str(e))
+            db.session.commit()
+
+    def _purge_table(self, job: Job) -> None:
+        model = TableRepository.model_for(job.target)
+        criteria = self._criteria(job.target)
+        if job.status == Job.QUEUED:
+            JobRepository.start(job, TableRepository.count(model, *criteria))
+            db.session.commit()
+
+        if "id" in model.__table__.c:
+            self._in_batches(
+                job,
+                model,
+                criteria,
+                lambda ids: self.delete_ids(job.target, ids, job.id),
+            )
+        else:
+            deleted = TableRepository.bulk_delete(model, *criteria)
+            JobRepository.advance(job, deleted)
+            db.session.commit()
+
+        self.after_delete(job.target)
+
+    def _purge_account(self, job: Job) -> None:
+        """Removes what the user owns in bounded batches, the user row last.
+
+        Every batch is its own short transaction, so a prolific account never
+        holds locks on posts or comments for long.
+        """
+
+        user_id = int(job.target)
+        steps = [
+            (
+                Comment,
+                [Comment.author_id == user_id],
+                lambda ids: PurgeRepository.delete_rows(Comment, ids),
+            ),
+            (Post, [Post.author_id == user_id], self._delete_posts),
+            (Image, [Image.author_id == user_id], PurgeRepository.delete_images),
+            (
+                VerificationCode,
+                [VerificationCode.user_id == user_id],
+                lambda ids: PurgeRepository.delete_rows(VerificationCode, ids),
+            ),
+        ]
+        saved_posts = [SavedPost.user_id == user_id]
+
+        if job.status == Job.QUEUED:
+            total = sum(
+                TableRepository.count(model, *where) for model, where, _ in steps
+            )
+            total += TableRepository.count(SavedPost, *saved_posts) + 1
+            JobRepository.start(job, total)
+            db.session.commit()
+
+        for model, criteria, delete in steps:
+            self._in_batches(job, model, criteria, delete)
+
+        JobRepository.advance(job, TableRepository.bulk_delete(SavedPost, *saved_posts))
+        db.session.commit()
+
+        public_ids = PurgeRepository.delete_users([user_id])
+        OutboxRepository.enqueue_image_destroys(public_ids, job.id)
+        JobRepository.advance(job, 1, len(public_ids))
+        ContentRevisionRepository.bump(ContentRevision.SITE)
+        db.session.commit()
+        user_cache.invalidate(user_id)
+
+    @staticmethod
+    def _in_batches(
+        job: Job,
+        model: Any,
+        criteria: Sequence[Any],
+        delete: Callable[[Sequence[int]], List[str]],
+    ) -> None:
+        """Deletes matching rows by ascending id, committing after every batch."""
+
+        last_id = 0
+        while True:
+            ids = TableRepository.next_ids(
+                model, criteria, last_id, Config.PURGE_BATCH_SIZE
+            )
+            if not ids:
+                return
+            public_ids = delete(ids)
+            OutboxRepository.enqueue_image_destroys(public_ids, job.id)
+            JobRepository.advance(job, len(ids), len(public_ids))
+            db.session.commit()
+            # The commit expired the job, so this reads the current owner.
+            if job.owner != job_heartbeat.runner_id:
+                raise JobTakenOver()
+            last_id = ids[-1]
+
+    @staticmethod
+    def _delete_posts(ids: Sequence[int]) -> List[str]:
+        RatingRollupRepository.remove(RatingRollupRepository.values_for_posts(ids))
+        return PurgeRepository.delete_posts(ids)
+
+    @staticmethod
+    def delete_ids(
+        table_name: str, ids: Sequence[int], job_id: Optional[int] = None
+    ) -> List[str]:
+        """Deletes the rows in the current transaction and queues their images.
+
+        Returns the public ids of the images queued for remote deletion.
+        """
+
+        removed_posts = REMOVED_POSTS.get(table_name)
+        if removed_posts is not None:
+            RatingRollupRepository.remove(
+                RatingRollupRepository.values_for_posts(removed_posts(ids))
+            )
+
+        purge = PURGERS.get(table_name)
+        if purge is not None:
+            public_ids = purge(ids)
+        else:
+            public_ids = PurgeRepository.delete_rows(
+                TableRepository.model_for(table_name), ids
+            )
+        OutboxRepository.enqueue_image_destroys(public_ids, job_id)
+        return public_ids
+
+    @staticmethod
+    def after_delete(table_name: str) -> None:
+        ContentRevisionRepository.bump(ContentRevision.SITE)
+        db.session.commit()
+        if table_name == "users":
+            user_cache.clear()
+
+    @staticmethod
+    def _criteria(table_name: str) -> List[Any]:
+        if table_name == "users":
+            return [User.role != UserRole.ADMIN]
+        return []
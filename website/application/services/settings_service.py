@@ -1,11 +1,18 @@
 from typing import Tuple, Any
 
-import cloudinary.uploader
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import logout_user
 
+from website.domain.models import ContentRevision
 from website.domain.models.user import User, UserRole, UserTheme
+from website.extensions import get_cloudinary_uploader
+from website.infrastructure.hashing import hash_password, verify_password
+from website.infrastructure.metrics import timed
+from website.infrastructure.repositories import (
+    ContentRevisionRepository,
+    OutboxRepository,
+)
 from website.infrastructure.repositories.user_repository import UserRepository
+from .purge_service import PurgeService
 
 
 class SettingsService:
@@ -19,16 +26,15 @@ class SettingsService:
         changes_made = False
 
         if avatar and avatar.filename:
-            if user.avatar_public_id:
-                try:
-                    cloudinary.uploader.destroy(user.avatar_public_id, invalidate=True)
-                except Exception:
-                    pass
-
-            upload_result = cloudinary.uploader.upload(avatar, resource_type="image")
+            with timed("cloudinary"):
+                upload_result = get_cloudinary_uploader().upload(
+                    avatar, resource_type="image"
+                )
             secure_url = upload_result.get("secure_url")
             public_id = upload_result.get("public_id")
             if secure_url and public_id:
+                if user.avatar_public_id:
+                    OutboxRepository.enqueue_image_destroy(user.avatar_public_id)
                 user.avatar_url = secure_url
                 user.avatar_public_id = public_id
                 changes_made = True
@@ -40,6 +46,8 @@ class SettingsService:
         if not changes_made:
             return False, "No changes made."
 
+        # Usernames and avatars appear on other people's pages too.
+        ContentRevisionRepository.bump(ContentRevision.SITE)
         UserRepository.save(user)
         return True, "Profile updated successfully."
 
@@ -48,14 +56,12 @@ class SettingsService:
             return False, "No avatar to delete."
 
         if user.avatar_public_id:
-            try:
-                cloudinary.uploader.destroy(user.avatar_public_id, invalidate=True)
-            except Exception:
-                pass
+            OutboxRepository.enqueue_image_destroy(user.avatar_public_id)
 
         user.avatar_url = None
         user.avatar_public_id = None
 
+        ContentRevisionRepository.bump(ContentRevision.SITE)
         UserRepository.save(user)
         return True, "Avatar deleted successfully."
 
@@ -68,10 +74,10 @@ class SettingsService:
         if not user.password_hash:
             return False, "Password change is not available."
 
-        if not check_password_hash(user.password_hash, current_password):
+        if not verify_password(user.password_hash, current_password):
             return False, "Current password is incorrect."
 
-        user.password_hash = generate_password_hash(new_password)
+        user.password_hash = hash_password(new_password)
         UserRepository.save(user)
         return True, "Password updated successfully."
 
@@ -89,12 +95,8 @@ class SettingsService:
         if is_admin or user.role == UserRole.ADMIN:
             return False, "Cannot delete an admin user."
 
-        if user.avatar_public_id:
-            try:
-                cloudinary.uploader.destroy(user.avatar_public_id, invalidate=True)
-            except Exception:
-                return False, "Failed to remove avatar image.", 500
-
-        UserRepository.delete(user)
+        # Signing in stops working now; posts, comments and images (the
+        # avatar included) are removed by a background job.
+        PurgeService().start_account(user)
         logout_user()
         return True, "Your account has been deleted."
@@ -0,0 +1,96 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import RLock
+from typing import Any, List, Optional, Tuple
+
+from website.config import Config
+from website.extensions import get_cloudinary_uploader
+from website.infrastructure.metrics import timed
+
+
+class UploadError(Exception):
+    pass
+
+
+class CloudinaryUploader:
+    def upload(self, file: Any, folder: str, timeout: float) -> Tuple[str, str]:
+        response = get_cloudinary_uploader().upload(
+            file, folder=folder, resource_type="image", timeout=timeout
+        )
+        url = response.get("secure_url")
+        public_id = response.get("public_id")
+        if not url or not public_id:
+            raise UploadError("The image host returned an incomplete response.")
+
+        return url, public_id
+
+    def destroy(self, public_id: str) -> None:
+        get_cloudinary_uploader().destroy(public_id, invalidate=True)
+
+
+class UploadService:
+    """Uploads all files of a request concurrently, all-or-nothing.
+
+    Any uploader exposing ``upload(file, folder, timeout)`` and
+    ``destroy(public_id)`` can be plugged in, e.g. a fake for benchmarks.
+    """
+
+    def __init__(
+        self,
+        uploader: Optional[Any] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.uploader = uploader or CloudinaryUploader()
+        self.max_workers = max_workers or Config.UPLOAD_MAX_WORKERS
+        self.timeout = timeout or Config.UPLOAD_TIMEOUT
+
+    def upload_all(self, files: List[Any], folder: str) -> List[Tuple[str, str]]:
+        if not files:
+            return []
+
+        failed = False
+        lock = RLock()
+
+        def discard_late_result(future: Future) -> None:
+            # Uploads that outlive the deadline still finish; undo them once they do.
+            with lock:
+                if failed and not future.cancelled() and future.exception() is None:
+                    self.discard([future.result()])
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(files), self.max_workers),
+            thread_name_prefix="upload",
+        )
+        futures = [
+            executor.submit(self.uploader.upload, file, folder, self.timeout)
+            for file in files
+        ]
+        with timed("cloudinary"):
+            done, pending = wait(futures, timeout=self.timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        with lock:
+            succeeded = [
+                f.result() for f in futures if f in done and f.exception() is None
+            ]
+            if len(succeeded) == len(files):
+                return succeeded
+
+            failed = True
+            for future in pending:
+                future.add_done_callback(discard_late_result)
+
+        self.discard(succeeded)
+        errors = [f.exception() for f in done if f.exception() is not None]
+        if errors:
+            raise UploadError(f"Image upload failed: {errors[0]}")
+        raise UploadError("Image upload timed out.")
+
+    def discard(self, uploads: List[Tuple[str, str]]) -> None:
+        """Best-effort removal of uploads whose post could not be saved."""
+
+        for _, public_id in uploads:
+            try:
+                self.uploader.destroy(public_id)
+            except Exception:
+                pass
@@ -12,8 +12,6 @@ class Config:
     SQLALCHEMY_DATABASE_URI = (
         f"postgresql+psycopg2://{os.getenv('DB_LOGIN')}:{os.getenv('DB_PASSWORD')}"
         f"@{os.getenv('DB_SERVER')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME')}")
-
-
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MAILJET_API_KEY = os.getenv("MAILJET_API_KEY")
     MAILJET_API_SECRET = os.getenv("MAILJET_API_SECRET")
@@ -30,6 +28,105 @@ class Config:
     RECAPTCHA_PRIVATE_KEY = os.getenv("RECAPTCHA_SECRET_KEY")
     RECAPTCHA_OPTIONS = {"theme": "light"}
 
+    # Database connection pool and statement timeouts.
+    # With PgBouncer in transaction mode the bouncer does the pooling and the
+    # pool settings below are ignored.
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+    # statement_timeout in milliseconds per blueprint; 0 disables it.
+    DB_STATEMENT_TIMEOUTS = {
+        "default": int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000")),
+        "admin": int(os.getenv("DB_ADMIN_STATEMENT_TIMEOUT_MS", "60000")),
+        "background": int(os.getenv("DB_BACKGROUND_STATEMENT_TIMEOUT_MS", "0")),
+    }
+
+    # Leaderboards and per-process caches.
+    LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "25"))
+    LEADERBOARD_MIN_POSTS = int(os.getenv("LEADERBOARD_MIN_POSTS", "1"))
+    # Anonymous page cache, per worker process.
+    PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "512"))
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "60"))
+    # Signed-in user identities, per worker process.
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+
+    # Rate limit counters. memory:// keeps them per worker, which is only right
+    # for a single process; production points this at Redis so every worker
+    # and node shares them, e.g. redis://redis:6379/0.
+    RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    RATELIMIT_STORAGE_OPTIONS = {"socket_timeout": 1, "socket_connect_timeout": 1}
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window")
+    RATELIMIT_KEY_PREFIX = os.getenv("RATELIMIT_KEY_PREFIX", "level-up")
+    # While the shared storage is unreachable, limits are kept per worker.
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    # Reverse proxies in front of the app (nginx); their X-Forwarded-* headers
+    # are trusted to find the client address. 0, the default, trusts none, so
+    # a client cannot pick its own address when the app is served directly.
+    PROXY_COUNT = int(os.getenv("PROXY_COUNT", "0"))
+    # Server-Timing headers reveal backend timings to every client.
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+    TIMING_WINDOW = int(os.getenv("TIMING_WINDOW", "200"))
+
+    # Pagination, exports, uploads and background jobs.
+    POSTS_PER_PAGE = int(os.getenv("POSTS_PER_PAGE", "10"))
+    COMMENTS_PER_PAGE = int(os.getenv("COMMENTS_PER_PAGE", "20"))
+    ADMIN_ROWS_PER_PAGE = int(os.getenv("ADMIN_ROWS_PER_PAGE", "50"))
+    ADMIN_MAX_ROWS_PER_PAGE = int(os.getenv("ADMIN_MAX_ROWS_PER_PAGE", "500"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", "5"))
+    UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "30"))
+    # "scheduler" drains the outbox inside the app, "external" leaves it to
+    # scripts/run_outbox_worker.py.
+    OUTBOX_WORKER = os.getenv("OUTBOX_WORKER", "scheduler")
+    # Threads do not survive fork: under gunicorn's preload_app the scheduler
+    # is started in each worker by gunicorn.conf.py instead.
+    SCHEDULER_AUTOSTART = os.getenv("SCHEDULER_AUTOSTART", "true").lower() == "true"
+    # "leader": one process per database runs the periodic jobs, elected with
+    # a Postgres advisory lock; "local": every process runs them; "off": none.
+    SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "leader")
+    SCHEDULER_LEADER_POLL_SECONDS = int(
+        os.getenv("SCHEDULER_LEADER_POLL_SECONDS", "15")
+    )
+    SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "72091843"))
+    # Direct (not PgBouncer) connection for the leader lock. Required for
+    # "leader" mode when DB_PGBOUNCER is set; defaults to the app's database.
+    SCHEDULER_LOCK_DATABASE_URI = os.getenv("SCHEDULER_LOCK_DATABASE_URI")
+    OUTBOX_POLL_SECONDS = int(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+    OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "10"))
+    OUTBOX_RETRY_MAX_SECONDS = int(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+    # Rows deleted per transaction by admin purges, and images per provider call.
+    PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+    # The process that owns a purge job beats every JOB_HEARTBEAT_SECONDS; a
+    # job without a beat for JOB_STALE_SECONDS lost its process and is resumed
+    # by the scheduler leader.
+    JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+    JOB_RESUME_SECONDS = int(os.getenv("JOB_RESUME_SECONDS", "60"))
+    JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "300"))
+    CLOUDINARY_DELETE_BATCH_SIZE = 100
+    # Expired verification codes are ignored on read and deleted in the
+    # background, at most MAX_BATCHES * BATCH_SIZE rows per run.
+    VERIFICATION_PURGE_SECONDS = int(os.getenv("VERIFICATION_PURGE_SECONDS", "600"))
+    VERIFICATION_PURGE_BATCH_SIZE = int(
+        os.getenv("VERIFICATION_PURGE_BATCH_SIZE", "500")
+    )
+    VERIFICATION_PURGE_MAX_BATCHES = int(
+        os.getenv("VERIFICATION_PURGE_MAX_BATCHES", "20")
+    )
+    VERIFICATION_PURGE_PAUSE_SECONDS = 0.1
+    VERIFICATION_PURGE_MAX_PAUSE_SECONDS = 5
+    # werkzeug method spec for new password hashes, e.g. "scrypt:32768:8:1" or
+    # "pbkdf2:sha256:600000". Older hashes are upgraded when their owner logs
+    # in. Size it with scripts/benchmark_hashing.py.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
 
 class DevelopmentConfig(Config):
     """Development-specific configuration."""
@@ -44,6 +141,9 @@ class ProductionConfig(Config):
 
     DEBUG = False
     PREFERRED_URL_SCHEME = "https"
+    # Off unless asked for: the header is sent to anonymous visitors too. The
+    # per-endpoint timings on the performance page are kept either way.
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
 
 
 
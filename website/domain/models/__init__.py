@@ -6,3 +6,8 @@ from .verification_code import VerificationCode
 from .post import Post, SavedPost
 from .image import Image, PostImage
 from .comment import Comment
+from .tag import Tag, PostTag
+from .outbox_message import OutboxMessage
+from .content_revision import ContentRevision
+from .rating_rollup import RatingRollup
+from .job import Job
@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Text,
     event,
@@ -14,6 +15,12 @@ from website import db
 
 class Comment(db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_comments_author_id", "author_id"),
+        Index("ix_comments_parent_comment_id", "parent_comment_id"),
+        Index("ix_comments_reply_to_comment_id", "reply_to_comment_id"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -29,16 +36,16 @@ class Comment(db.Model):
         nullable=False,
     )
     post_id: Mapped[int] = mapped_column(
-        ForeignKey("posts.id", ondelete="NO ACTION"),
+        ForeignKey("posts.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     parent_comment_id: Mapped[int] = mapped_column(
-        ForeignKey("comments.id", ondelete="NO ACTION"),
+        ForeignKey("comments.id", ondelete="CASCADE"),
         nullable=True,
     )
     reply_to_comment_id: Mapped[int] = mapped_column(
-        ForeignKey("comments.id", ondelete="NO ACTION"),
+        ForeignKey("comments.id", ondelete="SET NULL"),
         nullable=True,
     )
 
@@ -55,13 +62,11 @@ class Comment(db.Model):
     author = relationship(
         "User",
         back_populates="comments",
-        lazy="joined",
         passive_deletes=True,
     )
     post = relationship(
         "Post",
         back_populates="comments",
-        lazy="joined",
         passive_deletes=True,
     )
 
@@ -76,14 +81,12 @@ class Comment(db.Model):
         "Comment",
         back_populates="parent",
         foreign_keys=[parent_comment_id],
-        lazy="subquery",
         cascade="all, delete-orphan",
     )
     reply_to = relationship(
         "Comment",
         remote_side=[id],
         foreign_keys=[reply_to_comment_id],
-        lazy="joined",
         passive_deletes=True,
     )
 
@@ -101,25 +104,26 @@ class Comment(db.Model):
         return "Comment:\n  " + "\n  ".join(parts)
 
 
-@event.listens_for(Comment, "before_delete")
-def _delete_subcomments(mapper, connection, target: Comment):
-    Session.object_session(target).query(Comment).filter_by(
-        parent_comment_id=target.id
-    ).delete(synchronize_session=False)
+@event.listens_for(Session, "before_flush")
+def _collect_deleted_comments(session: Session, flush_context, instances):
+    deleted_ids = session.info.setdefault("deleted_comment_ids", set())
+    deleted_ids.update(
+        obj.id
+        for obj in session.deleted
+        if isinstance(obj, Comment) and obj.id is not None
+    )
 
 
 @event.listens_for(Session, "after_flush_postexec")
 def _delete_orphan_comments(session: Session, _):
-    existing_ids = session.query(Comment.id).subquery()
-
-    bad_parents = session.query(Comment).filter(
-        Comment.parent_comment_id.isnot(None),
-        ~Comment.parent_comment_id.in_(existing_ids),
+    deleted_ids = session.info.pop("deleted_comment_ids", None)
+    if not deleted_ids:
+        return
+
+    # Replies that only pointed at a deleted comment keep their place: the
+    # database sets reply_to_comment_id to NULL.
+    orphans = session.query(Comment).filter(
+        Comment.parent_comment_id.in_(deleted_ids)
     )
-    bad_replies = session.query(Comment).filter(
-        Comment.reply_to_comment_id.isnot(None),
-        ~Comment.reply_to_comment_id.in_(existing_ids),
-    )
-
-    for c in bad_parents.union(bad_replies):
+    for c in orphans:
         session.delete(c)
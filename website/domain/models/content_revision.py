@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from website import db
+
+
+class ContentRevision(db.Model):
+    """Counter bumped whenever the content behind a group of pages changes."""
+
+    __tablename__ = "content_revisions"
+
+    # Every page depends on SITE, feed pages on FEED, a post page on post(id).
+    SITE = "site"
+    FEED = "feed"
+
+    key: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+    )
+    revision: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+    @staticmethod
+    def post(post_id: int) -> str:
+        return f"post:{post_id}"
+
+    def __repr__(self) -> str:
+        return (
+            f"ContentRevision:\n"
+            f"Key: {self.key}\n"
+            f"Revision: {self.revision}\n"
+            f"Updated At: {self.updated_at}"
+        )
@@ -3,9 +3,11 @@ from datetime import datetime
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     event,
+    inspect,
 )
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
@@ -15,6 +17,7 @@ from .post import Post, PostImage
 
 class Image(db.Model):
     __tablename__ = "images"
+    __table_args__ = (Index("ix_images_author_id", "author_id"),)
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -69,22 +72,56 @@ class Image(db.Model):
         )
 
 
+@event.listens_for(Session, "before_flush")
+def _collect_orphan_candidates(session: Session, flush_context, instances):
+    """Remembers which images and posts may lose their last link in this flush."""
+
+    image_ids = session.info.setdefault("orphan_image_ids", set())
+    post_ids = session.info.setdefault("orphan_post_ids", set())
+
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            image_ids.update(image.id for image in obj.images)
+        elif isinstance(obj, Image):
+            post_ids.update(post.id for post in obj.posts)
+        elif isinstance(obj, PostImage):
+            image_ids.add(obj.image_id)
+            post_ids.add(obj.post_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            removed = inspect(obj).attrs.images.history.deleted
+            if removed:
+                image_ids.update(image.id for image in removed)
+                post_ids.add(obj.id)
+        elif isinstance(obj, Image):
+            removed = inspect(obj).attrs.posts.history.deleted
+            if removed:
+                post_ids.update(post.id for post in removed)
+                image_ids.add(obj.id)
+
+
 @event.listens_for(Session, "after_flush_postexec")
 def cleanup_orphaned(session: Session, _):
-    orphaned_images = (
-        session.query(Image)
-        .outerjoin(PostImage)
-        .filter(PostImage.image_id.is_(None))
-        .all()
-    )
-    for image in orphaned_images:
-        session.delete(image)
-
-    orphaned_posts = (
-        session.query(Post)
-        .outerjoin(PostImage)
-        .filter(PostImage.post_id.is_(None))
-        .all()
-    )
-    for post in orphaned_posts:
-        session.delete(post)
+    image_ids = session.info.pop("orphan_image_ids", set()) - {None}
+    post_ids = session.info.pop("orphan_post_ids", set()) - {None}
+
+    if image_ids:
+        orphaned_images = (
+            session.query(Image)
+            .outerjoin(PostImage)
+            .filter(Image.id.in_(image_ids), PostImage.image_id.is_(None))
+            .all()
+        )
+        for image in orphaned_images:
+            session.delete(image)
+
+    if post_ids:
+        orphaned_posts = (
+            session.query(Post)
+            .outerjoin(PostImage)
+            .filter(Post.id.in_(post_ids), PostImage.post_id.is_(None))
+            .all()
+        )
+        for post in orphaned_posts:
+            session.delete(post)
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from website import db
+
+
+class Job(db.Model):
+    """Progress of a long-running admin task executed outside the request."""
+
+    __tablename__ = "jobs"
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    PURGE_TABLE = "purge_table"
+    PURGE_ACCOUNT = "purge_account"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+    )
+    kind: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+    target: Mapped[str] = mapped_column(
+        String(150),
+        nullable=True,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=QUEUED,
+    )
+    total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    processed: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    # Remote files (Cloudinary images) queued for deletion and deleted so far.
+    assets_total: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    assets_destroyed: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    error: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+    # The process running the job and its last sign of life.
+    owner: Mapped[str] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "target": self.target,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "assets_total": self.assets_total,
+            "assets_destroyed": self.assets_destroyed,
+            "error": self.error,
+            "finished": self.status in (self.DONE, self.FAILED),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Job:\n"
+            f"ID: {self.id}\n"
+            f"Kind: {self.kind}\n"
+            f"Target: {self.target}\n"
+            f"Status: {self.status}\n"
+            f"Progress: {self.processed}/{self.total}"
+        )
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from website import db
+
+
+class OutboxMessage(db.Model):
+    __tablename__ = "outbox_messages"
+    __table_args__ = (Index("ix_outbox_messages_available_at", "available_at", "id"),)
+
+    SEND_EMAIL = "send_email"
+    DESTROY_IMAGE = "destroy_image"
+    DESTROY_IMAGES = "destroy_images"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+    )
+    kind: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+    payload: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    # NULL once the message has exhausted its retries and needs a human.
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        default=datetime.utcnow,
+    )
+    last_error: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"OutboxMessage:\n"
+            f"ID: {self.id}\n"
+            f"Kind: {self.kind}\n"
+            f"Attempts: {self.attempts}\n"
+            f"Available At: {self.available_at}"
+        )
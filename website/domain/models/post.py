@@ -1,13 +1,43 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, event
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from website import db
 
+SEARCH_CONFIG = "english"
+# Weighted document behind full-text search, generated and stored by Postgres.
+SEARCH_DOCUMENT = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (
+        ("title", "A"),
+        ("game_name", "A"),
+        ("game_developer", "B"),
+        ("category", "B"),
+        ("content", "C"),
+    )
+)
+
 
 class Post(db.Model):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_posts_author_id", "author_id"),
+    )
+
+    EXCERPT_WORDS = 100
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -26,6 +56,18 @@ class Post(db.Model):
         Text,
         nullable=False,
         )
+    content_html: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    excerpt_html: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    content_html_version: Mapped[str] = mapped_column(
+        String(16),
+        nullable=True,
+    )
     overall_rating: Mapped[int] = mapped_column(
         Integer, 
         nullable=False
@@ -91,6 +133,12 @@ class Post(db.Model):
         nullable=False,
     )
 
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_DOCUMENT, persisted=True),
+        deferred=True,
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
@@ -114,6 +162,12 @@ class Post(db.Model):
         lazy="subquery",
         order_by="Image.created_at",
     )
+    tags = relationship(
+        "Tag",
+        secondary="post_tags",
+        back_populates="posts",
+        order_by="Tag.name",
+    )
     saved_by = relationship(
         "SavedPost",
         back_populates="post",
@@ -134,6 +188,20 @@ class Post(db.Model):
         passive_deletes=True,
     )
 
+    def render_content(self) -> None:
+        """Stores the sanitized HTML of the content and, for long posts, its excerpt."""
+
+        from website.extensions import markdown_render_version, render_markdown
+
+        words = self.content.split(" ")
+        self.content_html = render_markdown(self.content).replace("\n", "")
+        self.excerpt_html = (
+            render_markdown(" ".join(words[: self.EXCERPT_WORDS])).replace("\n", "")
+            if len(words) > self.EXCERPT_WORDS
+            else None
+        )
+        self.content_html_version = markdown_render_version()
+
     def __repr__(self) -> str:
         return (
             f"Post:\n"
@@ -161,13 +229,17 @@ class Post(db.Model):
 
 class SavedPost(db.Model):
     __tablename__ = "saved_posts"
+    __table_args__ = (
+        Index("ix_saved_posts_user_id_saved_at", "user_id", "saved_at", "post_id"),
+        Index("ix_saved_posts_post_id", "post_id"),
+    )
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         primary_key=True,
     )
     post_id: Mapped[int] = mapped_column(
-        ForeignKey("posts.id", ondelete="NO ACTION"),  # or omit ondelete entirely
+        ForeignKey("posts.id", ondelete="CASCADE"),
         primary_key=True,
     )
 
@@ -199,13 +271,14 @@ class SavedPost(db.Model):
 
 class PostImage(db.Model):
     __tablename__ = "post_images"
+    __table_args__ = (Index("ix_post_images_image_id", "image_id"),)
 
     post_id: Mapped[int] = mapped_column(
         ForeignKey("posts.id", ondelete="CASCADE"),
         primary_key=True,
     )
     image_id: Mapped[int] = mapped_column(
-        ForeignKey("images.id", ondelete="NO ACTION"),
+        ForeignKey("images.id", ondelete="CASCADE"),
         primary_key=True,
     )
 
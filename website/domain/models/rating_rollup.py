@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from website import db
+
+
+class RatingRollup(db.Model):
+    """Running rating totals of one game, one category or a game in a category.
+
+    ALL in a key column means "every value", so ("rpg", ALL) aggregates the
+    whole category and (ALL, "elden ring") the game across categories.
+    """
+
+    __tablename__ = "rating_rollups"
+    __table_args__ = (
+        Index(
+            "ix_rating_rollups_category_key_overall_average",
+            "category_key",
+            "overall_average",
+        ),
+    )
+
+    # normalize() never returns leading whitespace, so no real name (not even
+    # an empty one) can collide with ALL.
+    ALL = " *"
+    # Rated fields and their highest value; histograms have one bucket per value.
+    RATINGS = {
+        "overall_rating": 5,
+        "story_rating": 5,
+        "gameplay_rating": 5,
+        "graphics_rating": 5,
+        "sound_design_rating": 5,
+        "replay_value_rating": 5,
+        "difficulty_rating": 5,
+        "bug_free_rating": 5,
+        "pc_requirements_rating": 5,
+        "game_length_blocks": 10,
+    }
+
+    category_key: Mapped[str] = mapped_column(
+        String(150),
+        primary_key=True,
+    )
+    game_key: Mapped[str] = mapped_column(
+        String(150),
+        primary_key=True,
+    )
+    category_name: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    game_name: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    post_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    totals: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+        default=dict,
+    )
+    histograms: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+        default=dict,
+    )
+    overall_average: Mapped[float] = mapped_column(
+        Float,
+        nullable=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return " ".join((name or "").split()).lower()[:150]
+
+    @staticmethod
+    def values_of(post: Any) -> Dict[str, Any]:
+        """The fields of a post that rollups depend on, detached from the post."""
+
+        values = {field: getattr(post, field) for field in RatingRollup.RATINGS}
+        values["game_name"] = post.game_name
+        values["category"] = post.category
+        return values
+
+    def add(self, values: Dict[str, Any], sign: int = 1) -> None:
+        """Adds (sign=1) or removes (sign=-1) one post's ratings."""
+
+        totals = dict(self.totals or {})
+        histograms = {k: list(v) for k, v in (self.histograms or {}).items()}
+
+        for field, highest in self.RATINGS.items():
+            value = min(max(int(values[field] or 1), 1), highest)
+            totals[field] = totals.get(field, 0) + sign * value
+            buckets = histograms.setdefault(field, [0] * highest)
+            buckets[value - 1] += sign
+
+        self.post_count = (self.post_count or 0) + sign
+        # Reassigned rather than mutated so the JSON columns are flagged dirty.
+        self.totals = totals
+        self.histograms = histograms
+        self.overall_average = (
+            totals["overall_rating"] / self.post_count if self.post_count else None
+        )
+        if sign > 0:
+            if self.category_key != self.ALL:
+                self.category_name = values["category"]
+            if self.game_key != self.ALL:
+                self.game_name = values["game_name"]
+
+    def average(self, field: str) -> float:
+        if not self.post_count:
+            return 0.0
+        return (self.totals or {}).get(field, 0) / self.post_count
+
+    def __repr__(self) -> str:
+        return (
+            f"RatingRollup:\n"
+            f"Category: {self.category_key}\n"
+            f"Game: {self.game_key}\n"
+            f"Posts: {self.post_count}\n"
+            f"Overall Average: {self.overall_average}"
+        )
@@ -0,0 +1,45 @@
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from website import db
+
+
+class Tag(db.Model):
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+    )
+    name: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        unique=True,
+    )
+
+    posts = relationship(
+        "Post",
+        secondary="post_tags",
+        back_populates="tags",
+        passive_deletes=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"Tag:\nID: {self.id}\nName: {self.name!r}"
+
+
+class PostTag(db.Model):
+    __tablename__ = "post_tags"
+    __table_args__ = (Index("ix_post_tags_post_id", "post_id"),)
+
+    tag_id: Mapped[int] = mapped_column(
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"PostTag: post_id={self.post_id}, tag_id={self.tag_id}"
@@ -5,9 +5,8 @@ from sqlalchemy import (
     Enum as SQLEnum,
     Integer,
     String,
-    event,
 )
-from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from flask_login import UserMixin
 
@@ -37,6 +36,8 @@ class User(db.Model, UserMixin):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Set when the owner deletes the account; a background job purges it later.
+    disabled_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
     images = relationship(
         "Image",
@@ -69,6 +70,10 @@ class User(db.Model, UserMixin):
         passive_deletes=True,
     )
 
+    @property
+    def is_active(self) -> bool:
+        return self.disabled_at is None
+
     def __repr__(self):
         return (
             f"User Info:\n"
@@ -80,27 +85,3 @@ class User(db.Model, UserMixin):
             f"Created At: {self.created_at}\n"
             f"Updated At: {self.updated_at}"
         )
-
-
-@event.listens_for(User, "before_delete")
-def _cleanup_user_related(mapper, connection, target: User):
-    session: Session = Session.object_session(target)
-
-    from .comment import Comment
-    from .image import Image
-    from .post import Post, SavedPost
-    from .verification_code import VerificationCode
-
-    session.query(Comment).filter_by(author_id=target.id).delete(
-        synchronize_session=False
-    )
-    session.query(Image).filter_by(author_id=target.id).delete(
-        synchronize_session=False
-    )
-    session.query(Post).filter_by(author_id=target.id).delete(synchronize_session=False)
-    session.query(SavedPost).filter_by(user_id=target.id).delete(
-        synchronize_session=False
-    )
-    session.query(VerificationCode).filter_by(user_id=target.id).delete(
-        synchronize_session=False
-    )
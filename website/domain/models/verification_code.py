@@ -1,22 +1,27 @@
 import secrets
 from datetime import datetime, timedelta
 
-from werkzeug.security import generate_password_hash
-
 from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from website import db
+from website.infrastructure.hashing import hash_code
 
 
 class VerificationCode(db.Model):
     __tablename__ = "verification_codes"
+    __table_args__ = (
+        Index("ix_verification_codes_user_id", "user_id"),
+        # Lets the cleanup walk expired codes oldest first instead of scanning.
+        Index("ix_verification_codes_expires_at", "expires_at"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -53,8 +58,8 @@ class VerificationCode(db.Model):
 
     def __init__(self, user_id: int, code: str):
         self.user_id = user_id
-        self.code_hash = generate_password_hash(code)
         self.token = secrets.token_urlsafe(16)
+        self.code_hash = hash_code(self.token, code)
         self.is_valid = False
         self.expires_at = datetime.utcnow() + timedelta(minutes=2)
 
@@ -70,10 +75,3 @@ class VerificationCode(db.Model):
 
     def is_expired(self) -> bool:
         return datetime.utcnow() > self.expires_at
-
-    @staticmethod
-    def delete_expired() -> None:
-        db.session.query(VerificationCode).filter(
-            VerificationCode.expires_at < datetime.utcnow()
-        ).delete()
-        db.session.commit()
@@ -1,23 +1,22 @@
 import os
-import re
+import json
 import atexit
+import hashlib
+import functools
 import urllib.parse
 
-from authlib.integrations.flask_client import OAuth
 from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
-from flask import request
+from flask import current_app, request
+from jinja2 import pass_context
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_login import LoginManager
+from flask_login import LoginManager, current_user
 from flask_mail import Mail
 from flask_sqlalchemy import SQLAlchemy
-
-import bleach
-import markdown as _md
 from markupsafe import Markup
 
-import cloudinary
+from website.utils import HASHTAG_PATTERN
 
 # -----------------------------------------------------------------------------
 # Load Environment Variables
@@ -27,40 +26,79 @@ load_dotenv()
 # -----------------------------------------------------------------------------
 # Flask Extensions
 # -----------------------------------------------------------------------------
+def rate_limit_key() -> str:
+    """Signed-in users are limited per account, everyone else per client address.
+
+    The address is the one the trusted proxy reports (see PROXY_COUNT), so
+    clients behind nginx do not share one bucket.
+    """
+
+    if current_user.is_authenticated:
+        return f"user:{current_user.get_id()}"
+    return get_remote_address()
+
+
 db = SQLAlchemy()
 login_manager = LoginManager()
 mail = Mail()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=rate_limit_key)
 scheduler = BackgroundScheduler()
-oauth = OAuth()
 
 # -----------------------------------------------------------------------------
 # Cloudinary Configuration
 # -----------------------------------------------------------------------------
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_SECRET"),
-)
+# Optional integrations are imported on first use so that workers which never
+# touch them do not pay for the import at startup.
+
+
+@functools.cache
+def get_cloudinary_uploader():
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_SECRET"),
+    )
+    return cloudinary.uploader
+
+
+@functools.cache
+def get_cloudinary_api():
+    """The Admin API, which deletes up to 100 resources per call."""
+
+    import cloudinary.api
+
+    get_cloudinary_uploader()
+    return cloudinary.api
+
 
 # -----------------------------------------------------------------------------
 # OAuth Providers
 # -----------------------------------------------------------------------------
-google = oauth.register(
-    name="google",
-    client_id=os.getenv("CLIENT_ID"),
-    client_secret=os.getenv("CLIENT_SECRET"),
-    client_kwargs={"scope": "openid profile email"},
-    authorize_url="https://accounts.google.com/o/oauth2/v2/auth",
-    access_token_url="https://oauth2.googleapis.com/token",
-    refresh_token_url="https://oauth2.googleapis.com/token",
-    jwks_uri="https://www.googleapis.com/oauth2/v3/certs",
-)
+def get_google():
+    client = current_app.extensions.get("google_oauth")
+    if client is None:
+        from authlib.integrations.flask_client import OAuth
+
+        client = OAuth(current_app).register(
+            name="google",
+            client_id=os.getenv("CLIENT_ID"),
+            client_secret=os.getenv("CLIENT_SECRET"),
+            client_kwargs={"scope": "openid profile email"},
+            authorize_url="https://accounts.google.com/o/oauth2/v2/auth",
+            access_token_url="https://oauth2.googleapis.com/token",
+            refresh_token_url="https://oauth2.googleapis.com/token",
+            jwks_uri="https://www.googleapis.com/oauth2/v3/certs",
+        )
+        current_app.extensions["google_oauth"] = client
+    return client
 
 # -----------------------------------------------------------------------------
 # Markdown + Bleach Configuration
 # -----------------------------------------------------------------------------
-ALLOWED_TAGS = set(bleach.sanitizer.ALLOWED_TAGS) | {
+EXTRA_ALLOWED_TAGS = {
     "p",
     "pre",
     "code",
@@ -88,8 +126,7 @@ ALLOWED_TAGS = set(bleach.sanitizer.ALLOWED_TAGS) | {
     "strong",
     "em",
 }
-ALLOWED_ATTRS = {
-    **bleach.sanitizer.ALLOWED_ATTRIBUTES,
+EXTRA_ALLOWED_ATTRS = {
     "*": ["class"],  # allow Tailwind classes
     "a": ["href", "title", "rel", "target", "class"],
     "img": ["src", "alt", "title", "width", "height", "loading", "class"],
@@ -97,25 +134,68 @@ ALLOWED_ATTRS = {
 MD_EXTENSIONS = ["fenced_code", "tables", "codehilite", "attr_list"]
 
 
+@functools.cache
+def _sanitizer_settings():
+    import bleach
+
+    allowed_tags = set(bleach.sanitizer.ALLOWED_TAGS) | EXTRA_ALLOWED_TAGS
+    allowed_attrs = {**bleach.sanitizer.ALLOWED_ATTRIBUTES, **EXTRA_ALLOWED_ATTRS}
+    return allowed_tags, allowed_attrs
+
+
+@functools.cache
+def markdown_render_version() -> str:
+    """Stamp stored with rendered post HTML.
+
+    Changing the renderer or the sanitizer settings changes it, which marks
+    every stored rendering as stale.
+    """
+
+    import bleach
+    import markdown as _md
+
+    allowed_tags, allowed_attrs = _sanitizer_settings()
+    return hashlib.sha1(
+        json.dumps(
+            [
+                _md.__version__,
+                bleach.__version__,
+                MD_EXTENSIONS,
+                sorted(allowed_tags),
+                {tag: sorted(attrs) for tag, attrs in allowed_attrs.items()},
+            ],
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()[:16]
+
+
+def render_markdown(markdown_text: str) -> str:
+    import bleach
+    import markdown as _md
+
+    allowed_tags, allowed_attrs = _sanitizer_settings()
+    html_output = _md.markdown(
+        markdown_text or "", extensions=MD_EXTENSIONS, output_format="html5"
+    )
+    return bleach.clean(
+        html_output, tags=allowed_tags, attributes=allowed_attrs, strip=True
+    )
+
+
 def init_markdown(app):
     @app.template_filter("markdown")
-    def render_markdown(markdown_text: str):
-        html_output = _md.markdown(
-            markdown_text or "", extensions=MD_EXTENSIONS, output_format="html5"
-        )
-        sanitized_output = bleach.clean(
-            html_output, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS, strip=True
-        )
-        return Markup(sanitized_output)
+    def markdown_filter(markdown_text: str):
+        return Markup(render_markdown(markdown_text))
 
     @app.template_filter("link_hashtags")
-    def link_hashtags(text: str):
-        current_path = request.path
+    @pass_context
+    def link_hashtags(context, text: str):
+        current_path = context.get("hashtag_path") or request.path
         selected_tags = request.args.getlist("tag")
 
         def replace_hashtag(match_obj):
-            hashtag_text = match_obj.group(1)
-            tag_text = hashtag_text.lstrip("#")
+            hashtag_text = match_obj.group(0)
+            tag_text = match_obj.group(1)
             updated_tags = selected_tags.copy()
 
             if tag_text in updated_tags:
@@ -137,27 +217,60 @@ def init_markdown(app):
                 f"{hashtag_text}</a>"
             )
 
-        linked_text = re.sub(r"(#\w+)", replace_hashtag, text)
+        linked_text = HASHTAG_PATTERN.sub(replace_hashtag, text)
         return Markup(linked_text)
 
 
-def schedule_jobs(app):
-    def cleanup_expired_codes():
-        from website.domain.models import VerificationCode
+def run_in_background(app, func, *args):
+    """Runs func(*args) once on the scheduler's threads, inside an app context."""
 
+    def job():
         with app.app_context():
-            VerificationCode.delete_expired()
-            db.session.commit()
+            func(*args)
+
+    scheduler.add_job(job, misfire_grace_time=None)
+
+
+def schedule_jobs(app):
+    """Registers the @periodic jobs of website.application.jobs."""
+
+    from website.application import jobs  # noqa: F401 (registers the jobs)
+    from website.infrastructure.scheduling import install_periodic_jobs
 
     if not scheduler.get_jobs():
-        scheduler.add_job(cleanup_expired_codes, "interval", minutes=2)
+        install_periodic_jobs(scheduler, app)
+    if app.config["SCHEDULER_AUTOSTART"]:
+        start_scheduler()
+
+
+def start_scheduler():
+    """Starts the scheduler threads of this process, once."""
+
+    from website.infrastructure.scheduling import leader
+
+    if not scheduler.running:
         scheduler.start()
+        atexit.register(leader.release)
         atexit.register(lambda: scheduler.shutdown())
 
 
 @login_manager.user_loader
 def load_user(user_id: str):
+    """Returns the cached identity; Flask-Login keeps it for the request."""
+
     from website.domain.models import User
+    from website.infrastructure.user_cache import CachedUser, user_cache
+
+    cached = user_cache.get(int(user_id))
+    if cached is not None:
+        return cached
 
+    generation = user_cache.generation
     with db.session() as session:
-        return session.get(User, int(user_id))
+        user = session.get(User, int(user_id))
+        # Sessions of an account that is being deleted end right away.
+        if not user or not user.is_active:
+            return None
+        cached = CachedUser(user)
+    user_cache.set(cached, generation)
+    return cached
@@ -0,0 +1,260 @@
+import json
+import queue
+import threading
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Sequence, Union
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Engine
+
+# A backup is a gzip stream: the MAGIC line, then per table a header line with
+# its columns followed by the table's rows in COPY text format, ending with
+# the END_OF_DATA line (which COPY never emits for a row).
+MAGIC = b"-- level-up-reviews backup 1\n"
+SECTION = b"-- table "
+END_OF_DATA = b"\\.\n"
+
+CHUNK_BYTES = 256 * 1024
+# Chunks waiting for the client; the dump pauses while the queue is full.
+QUEUED_CHUNKS = 8
+
+
+class BackupFormatError(ValueError):
+    pass
+
+
+class _BackupCancelled(Exception):
+    pass
+
+
+def _quote(engine: Engine, name: str) -> str:
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+def copy_columns(table: Table) -> List[str]:
+    """Columns that COPY can write; generated columns are recomputed on load."""
+
+    return [column.name for column in table.columns if column.computed is None]
+
+
+class _QueueWriter:
+    """File-like target of COPY ... TO STDOUT that hands chunks to the client."""
+
+    def __init__(self, chunks: queue.Queue, stop: threading.Event) -> None:
+        self._chunks = chunks
+        self._stop = stop
+        self._buffer = bytearray()
+
+    def write(self, data: Union[bytes, str]) -> int:
+        if self._stop.is_set():
+            raise _BackupCancelled()
+        self._buffer += data.encode() if isinstance(data, str) else data
+        if len(self._buffer) >= CHUNK_BYTES:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item: Any) -> None:
+        while True:
+            try:
+                self._chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _BackupCancelled()
+
+
+def _dump(engine: Engine, tables: Sequence[Table], writer: _QueueWriter) -> None:
+    connection = engine.raw_connection()
+    try:
+        connection.rollback()
+        cursor = connection.cursor()
+        # One snapshot for every table, so foreign keys line up on restore.
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        cursor.execute("SET LOCAL statement_timeout = 0")
+
+        writer.write(MAGIC)
+        for table in tables:
+            columns = copy_columns(table)
+            header = {"table": table.name, "columns": columns}
+            writer.write(SECTION + json.dumps(header).encode() + b"\n")
+            selected = ", ".join(_quote(engine, name) for name in columns)
+            order = ", ".join(_quote(engine, c.name) for c in table.primary_key)
+            cursor.copy_expert(
+                f"COPY (SELECT {selected} FROM {_quote(engine, table.name)} "
+                f"ORDER BY {order}) TO STDOUT",
+                writer,
+            )
+            writer.write(END_OF_DATA)
+        writer.flush()
+        writer.put(None)
+    except _BackupCancelled:
+        pass
+    except Exception as e:
+        try:
+            writer.put(e)
+        except _BackupCancelled:
+            pass
+    finally:
+        connection.close()
+
+
+def backup_chunks(engine: Engine, tables: Sequence[Table]) -> Iterator[bytes]:
+    """Streams a gzipped backup of the tables, given in dependency order.
+
+    COPY runs on its own connection in a background thread and blocks while
+    the client is behind, so memory stays bounded by QUEUED_CHUNKS.
+    """
+
+    chunks: queue.Queue = queue.Queue(maxsize=QUEUED_CHUNKS)
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_dump,
+        args=(engine, tables, _QueueWriter(chunks, stop)),
+        name="database-backup",
+        daemon=True,
+    )
+    worker.start()
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        # Also reached when the client goes away; the worker then stops at
+        # its next write and releases the connection.
+        stop.set()
+
+
+class _SectionReader:
+    """File-like source of COPY ... FROM STDIN for one table of a backup."""
+
+    def __init__(self, source: BinaryIO) -> None:
+        self._source = source
+        self._done = False
+        self.rows = 0
+
+    def read(self, size: int = -1) -> bytes:
+        lines = []
+        total = 0
+        while not self._done and (size < 0 or total < size):
+            line = self._source.readline()
+            if not line:
+                raise BackupFormatError("The backup ends in the middle of a table.")
+            if line == END_OF_DATA:
+                self._done = True
+                break
+            lines.append(line)
+            total += len(line)
+            self.rows += 1
+        return b"".join(lines)
+
+
+def _drop_secondary_indexes(cursor: Any, tables: Sequence[Table]) -> List[str]:
+    """Drops the plain indexes of the tables and returns how to recreate them.
+
+    Primary keys and unique indexes stay, since constraints depend on them.
+    """
+
+    cursor.execute(
+        "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+        "FROM pg_index i "
+        "WHERE i.indrelid = ANY(%s::regclass[]) AND NOT i.indisunique "
+        "AND NOT i.indisprimary",
+        ([table.name for table in tables],),
+    )
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f"DROP INDEX {name}")
+    return [definition for _, definition in indexes]
+
+
+def _reset_sequences(cursor: Any, engine: Engine, tables: Sequence[Table]) -> None:
+    for table in tables:
+        for column in table.primary_key:
+            cursor.execute(
+                "SELECT pg_get_serial_sequence(%s, %s)", (table.name, column.name)
+            )
+            sequence = cursor.fetchone()[0]
+            if sequence:
+                highest = f"MAX({_quote(engine, column.name)})"
+                cursor.execute(
+                    f"SELECT setval(%s, COALESCE({highest}, 0) + 1, false) "
+                    f"FROM {_quote(engine, table.name)}",
+                    (sequence,),
+                )
+
+
+def restore(
+    engine: Engine, source: BinaryIO, tables: Sequence[Table]
+) -> Dict[str, int]:
+    """Replaces the contents of the tables with a backup in one transaction.
+
+    `source` is the decompressed backup. Plain indexes are dropped while rows
+    are loaded and rebuilt once at the end, and serial sequences continue
+    after the restored ids. Returns the number of rows loaded per table.
+    """
+
+    if source.readline() != MAGIC:
+        raise BackupFormatError("This is not a backup of this site.")
+
+    known = {table.name: table for table in tables}
+    counts: Dict[str, int] = {}
+    connection = engine.raw_connection()
+    try:
+        connection.rollback()
+        cursor = connection.cursor()
+        cursor.execute("SET LOCAL statement_timeout = 0")
+        cursor.execute(
+            f"TRUNCATE {', '.join(_quote(engine, name) for name in known)} "
+            f"RESTART IDENTITY CASCADE"
+        )
+        indexes = _drop_secondary_indexes(cursor, tables)
+
+        for header in iter(source.readline, b""):
+            if not header.startswith(SECTION):
+                raise BackupFormatError("The backup is damaged.")
+            section = json.loads(header[len(SECTION) :])
+            table = known.get(section["table"])
+            if table is None:
+                raise BackupFormatError(f"Unknown table '{section['table']}'.")
+            unknown = set(section["columns"]) - set(copy_columns(table))
+            if unknown:
+                raise BackupFormatError(
+                    f"Unknown columns in '{table.name}': {', '.join(sorted(unknown))}."
+                )
+
+            reader = _SectionReader(source)
+            columns = ", ".join(_quote(engine, c) for c in section["columns"])
+            cursor.copy_expert(
+                f"COPY {_quote(engine, table.name)} ({columns}) FROM STDIN",
+                reader,
+                size=CHUNK_BYTES,
+            )
+            counts[table.name] = reader.rows
+
+        for definition in indexes:
+            cursor.execute(definition)
+        _reset_sequences(cursor, engine, tables)
+        for table in tables:
+            cursor.execute(f"ANALYZE {_quote(engine, table.name)}")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    return counts
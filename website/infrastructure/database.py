@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def statistics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+            timeouts = self._timeouts
+
+        return {
+            "pool": type(self).__name__,
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_avg_ms": round(wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "wait_max_ms": round(wait_max * 1000, 3),
+        }
+
+
+POOL_SIZING_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle")
+
+
+def init_engine_options(app: Flask) -> None:
+    """Picks the pool class before Flask-SQLAlchemy builds the engine.
+
+    Behind PgBouncer in transaction mode the bouncer owns pooling, so the app
+    opens a fresh connection per checkout instead of holding its own pool.
+    Also installs the per-route statement_timeout hook on every engine.
+    """
+
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    if app.config.get("DB_PGBOUNCER"):
+        options = {k: v for k, v in options.items() if k not in POOL_SIZING_OPTIONS}
+        options["poolclass"] = NullPool
+    elif app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        options = {k: v for k, v in options.items() if k not in POOL_SIZING_OPTIONS}
+    else:
+        options.setdefault("poolclass", InstrumentedQueuePool)
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    if not event.contains(Engine, "begin", _set_statement_timeout):
+        event.listen(Engine, "begin", _set_statement_timeout)
+
+
+def statement_timeout_for(timeouts: Dict[str, int]) -> Optional[int]:
+    """Returns the timeout in milliseconds for the route class being served.
+
+    Requests use the entry for their blueprint, falling back to "default";
+    work outside a request (scheduler, scripts) uses "background".
+    """
+
+    if not has_request_context():
+        return timeouts.get("background")
+    return timeouts.get(request.blueprint or "", timeouts.get("default"))
+
+
+def _set_statement_timeout(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql" or not has_app_context():
+        return
+
+    milliseconds = statement_timeout_for(current_app.config["DB_STATEMENT_TIMEOUTS"])
+    if milliseconds:
+        # SET LOCAL ends with the transaction, so the setting never leaks to
+        # the next checkout, including through PgBouncer.
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(milliseconds)}")
+
+
+def pool_statistics(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.statistics()
+    return {"pool": type(pool).__name__, "status": pool.status()}
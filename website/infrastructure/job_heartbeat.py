@@ -0,0 +1,68 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+from website.config import Config
+
+
+class JobHeartbeat:
+    """Keeps the jobs this process owns marked as alive, from a thread of its own.
+
+    The beat does not wait for the scheduler's threads, so a job queued behind
+    busy ones, or blocked in one long statement, is not taken for dead. It
+    stops only with the process, and then the leader resumes the job.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self._seconds = seconds
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._runner_id = ""
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def runner_id(self) -> str:
+        """Identity of this process; gunicorn's forked workers each get their own."""
+
+        with self._lock:
+            self._check_fork()
+            return self._runner_id
+
+    def ensure_started(self, app) -> None:
+        with self._lock:
+            self._check_fork()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(app, self._runner_id),
+                    name="job-heartbeat",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _check_fork(self) -> None:
+        # Threads do not survive fork, and the parent's id must not be shared.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._runner_id = f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}"
+            self._thread = None
+
+    def _run(self, app, runner_id: str) -> None:
+        from website import db
+        from website.infrastructure.repositories import JobRepository
+
+        while True:
+            time.sleep(self._seconds)
+            try:
+                with app.app_context():
+                    JobRepository.beat(runner_id)
+                    db.session.commit()
+            except Exception as e:
+                print(f"Error recording the job heartbeat: {str(e)}")
+
+
+job_heartbeat = JobHeartbeat(Config.JOB_HEARTBEAT_SECONDS)
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from website.config import Config
+
+# Segments reported for every request, in Server-Timing order.
+SEGMENTS = ("db", "template", "cloudinary", "mailjet", "google")
+
+
+class RequestTimings:
+    """Time and call counts spent per segment while serving one request."""
+
+    __slots__ = ("started", "segments")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.segments: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        segment = self.segments.setdefault(name, [0, 0.0])
+        segment[0] += 1
+        segment[1] += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        entries = []
+        for name in SEGMENTS:
+            if name in self.segments:
+                count, seconds = self.segments[name]
+                entries.append(f'{name};dur={seconds * 1000:.2f};desc="{count}x"')
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    if not has_request_context():
+        return None
+    return g.get("request_timings")
+
+
+@contextmanager
+def timed(segment: str) -> Iterator[None]:
+    """Adds the time spent in the block to the current request, if there is one."""
+
+    timings = current_timings()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(segment, time.perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    timings = current_timings()
+    if timings is not None:
+        timings.add("db", time.perf_counter() - started)
+
+
+def register_sql_timing() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class EndpointStats:
+    """Rolling window of the latest requests per endpoint, kept per process."""
+
+    def __init__(self, window: int) -> None:
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[Tuple[float, Dict[str, List[float]]]]] = (
+            defaultdict(lambda: deque(maxlen=window))
+        )
+        self._totals: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, timings: RequestTimings, total: float) -> None:
+        segments = {name: list(value) for name, value in timings.segments.items()}
+        with self._lock:
+            self._samples[endpoint].append((total, segments))
+            self._totals[endpoint] += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            snapshot = {
+                endpoint: list(samples) for endpoint, samples in self._samples.items()
+            }
+            totals = dict(self._totals)
+
+        rows = []
+        for endpoint, samples in snapshot.items():
+            durations = [total for total, _ in samples]
+            row = {
+                "endpoint": endpoint,
+                "requests": totals[endpoint],
+                "window": len(samples),
+                "p50_ms": _percentile(durations, 0.5) * 1000,
+                "p95_ms": _percentile(durations, 0.95) * 1000,
+                "max_ms": max(durations) * 1000,
+            }
+            for name in SEGMENTS:
+                row[f"{name}_calls"] = (
+                    sum(s.get(name, (0, 0.0))[0] for _, s in samples) / len(samples)
+                )
+                row[f"{name}_ms"] = (
+                    sum(s.get(name, (0, 0.0))[1] for _, s in samples)
+                    / len(samples)
+                    * 1000
+                )
+            rows.append(row)
+
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+endpoint_stats = EndpointStats(Config.TIMING_WINDOW)
+
+
+class JobStats:
+    """Durations, failures and overlaps of periodic jobs, kept per process."""
+
+    def __init__(self, window: int) -> None:
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"runs": 0, "failures": 0, "overlaps": 0, "items": 0}
+        )
+        self._last_run: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float, succeeded: bool, items: int) -> None:
+        """Adds one run; `items` is what the job reports it handled (rows, emails)."""
+
+        with self._lock:
+            self._durations[name].append(seconds)
+            self._counts[name]["runs"] += 1
+            self._counts[name]["items"] += items
+            if not succeeded:
+                self._counts[name]["failures"] += 1
+            self._last_run[name] = time.time()
+
+    def record_overlap(self, name: str) -> None:
+        """Counts a run skipped because the previous one was still going."""
+
+        with self._lock:
+            self._counts[name]["overlaps"] += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            counts = {name: dict(values) for name, values in self._counts.items()}
+            last_run = dict(self._last_run)
+
+        rows = []
+        for name, row in sorted(counts.items()):
+            values = durations.get(name)
+            row["name"] = name
+            row["last_run"] = last_run.get(name)
+            row["p50_ms"] = _percentile(values, 0.5) * 1000 if values else None
+            row["p95_ms"] = _percentile(values, 0.95) * 1000 if values else None
+            row["max_ms"] = max(values) * 1000 if values else None
+            rows.append(row)
+        return rows
+
+
+job_stats = JobStats(Config.TIMING_WINDOW)
@@ -0,0 +1,82 @@
+import threading
+from typing import Any, Dict, FrozenSet, Hashable, Optional
+
+from cachetools import TTLCache
+
+from website.config import Config
+
+class CachedPage:
+    __slots__ = ("body", "status", "headers", "tags")
+
+    def __init__(
+        self, body: bytes, status: int, headers: Dict[str, str], tags: FrozenSet[str]
+    ) -> None:
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.tags = tags
+
+
+class PageCache:
+    """Rendered pages for anonymous readers, dropped by tag when content changes.
+
+    Each worker process keeps its own copy; the TTL bounds how long a page can
+    outlive a change made through another worker, and how stale relative
+    timestamps ("5min ago") can get.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._lock = threading.Lock()
+        self._pages: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return page
+
+    def set(self, key: Hashable, page: CachedPage, generation: int) -> None:
+        """Stores a page unless an invalidation happened while it was rendered."""
+
+        with self._lock:
+            if generation == self._generation:
+                self._pages[key] = page
+
+    def invalidate(self, *tags: str) -> None:
+        dropped = set(tags)
+        with self._lock:
+            self._generation += 1
+            self._pages.expire()
+            stale = [key for key, page in self._pages.items() if page.tags & dropped]
+            for key in stale:
+                del self._pages[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._pages.clear()
+
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._pages),
+                "maxsize": self._pages.maxsize,
+                "ttl": self._pages.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+page_cache = PageCache(Config.PAGE_CACHE_SIZE, Config.PAGE_CACHE_TTL)
@@ -3,5 +3,11 @@ from .verification_code_repository import VerificationCodeRepository
 
 from .post_repository import PostRepository, SavedPostRepository, ImageRepository
 from .comment_repository import CommentRepository
+from .tag_repository import TagRepository
+from .content_revision_repository import ContentRevisionRepository
+from .rating_rollup_repository import RatingRollupRepository
 
+from .outbox_repository import OutboxRepository
+from .job_repository import JobRepository
+from .purge_repository import PurgeRepository
 from .table_repository import TableRepository
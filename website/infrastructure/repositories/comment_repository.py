@@ -1,7 +1,39 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import aliased
 
 from website import db
-from website.domain.models import Comment
+from website.domain.models import Comment, User
+from .pagination import encode_cursor, keyset_window
+
+
+class CommentNode:
+    """Read-only comment projection with its replies attached."""
+
+    __slots__ = (
+        "id",
+        "content",
+        "author_id",
+        "author_username",
+        "author_avatar_url",
+        "parent_comment_id",
+        "reply_to_username",
+        "created_at",
+        "replies",
+    )
+
+    def __init__(self, row) -> None:
+        self.id: int = row.id
+        self.content: str = row.content
+        self.author_id: int = row.author_id
+        self.author_username: str = row.author_username
+        self.author_avatar_url: Optional[str] = row.author_avatar_url
+        self.parent_comment_id: Optional[int] = row.parent_comment_id
+        self.reply_to_username: Optional[str] = row.reply_to_username
+        self.created_at: datetime = row.created_at
+        self.replies: List["CommentNode"] = []
 
 
 class CommentRepository:
@@ -20,12 +52,71 @@ class CommentRepository:
         db.session.commit()
 
     @staticmethod
-    def list_by_post(post_id: int, order: str = "asc") -> List[Comment]:
-        query = Comment.query.filter_by(post_id=post_id)
+    def count_by_post(post_id: int) -> int:
+        return Comment.query.filter_by(post_id=post_id).count()
+
+    @staticmethod
+    def list_threads(
+        post_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        order: str = "asc",
+    ) -> Tuple[List[CommentNode], Optional[str]]:
+        """Loads one page of top-level comments and all their replies in one query."""
+
+        descending = order == "desc"
+        page_ids = keyset_window(
+            select(Comment.id).where(
+                Comment.post_id == post_id,
+                Comment.parent_comment_id.is_(None),
+            ),
+            (Comment.created_at, Comment.id),
+            limit,
+            cursor,
+            descending,
+        ).scalar_subquery()
+
+        reply_to = aliased(Comment)
+        reply_to_author = aliased(User)
+        rows = db.session.execute(
+            select(
+                Comment.id,
+                Comment.content,
+                Comment.author_id,
+                Comment.parent_comment_id,
+                Comment.created_at,
+                User.username.label("author_username"),
+                User.avatar_url.label("author_avatar_url"),
+                reply_to_author.username.label("reply_to_username"),
+            )
+            .join(User, User.id == Comment.author_id)
+            .outerjoin(reply_to, reply_to.id == Comment.reply_to_comment_id)
+            .outerjoin(reply_to_author, reply_to_author.id == reply_to.author_id)
+            .where(
+                Comment.post_id == post_id,
+                or_(
+                    Comment.id.in_(page_ids),
+                    Comment.parent_comment_id.in_(page_ids),
+                ),
+            )
+            .order_by(Comment.created_at, Comment.id)
+        ).all()
+
+        nodes: Dict[int, CommentNode] = {row.id: CommentNode(row) for row in rows}
+        threads: List[CommentNode] = []
+        for node in nodes.values():
+            parent = nodes.get(node.parent_comment_id)
+            if parent is not None:
+                parent.replies.append(node)
+            elif node.parent_comment_id is None:
+                threads.append(node)
+
+        if descending:
+            threads.reverse()
 
-        if order == "desc":
-            query = query.order_by(Comment.created_at.desc())
-        else:
-            query = query.order_by(Comment.created_at.asc())
+        if len(threads) <= limit:
+            return threads, None
 
-        return query.all()
+        threads = threads[:limit]
+        last = threads[-1]
+        return threads, encode_cursor((last.created_at, last.id))
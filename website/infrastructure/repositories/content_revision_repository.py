@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Iterable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from website import db
+from website.domain.models import ContentRevision
+from website.infrastructure.page_cache import page_cache
+from .dialects import upsert
+
+
+class ContentRevisionRepository:
+    @staticmethod
+    def bump(*keys: str) -> None:
+        """Bumps the revisions in the current transaction; the caller commits it.
+
+        Once the commit succeeds the cached pages depending on the keys are
+        dropped as well.
+        """
+
+        now = datetime.utcnow()
+        for key in keys:
+            statement = upsert(ContentRevision).values(
+                key=key, revision=1, updated_at=now
+            )
+            db.session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ContentRevision.key],
+                    set_={
+                        "revision": ContentRevision.revision + 1,
+                        "updated_at": now,
+                    },
+                )
+            )
+        db.session.info.setdefault("bumped_revisions", set()).update(keys)
+
+    @staticmethod
+    def get_many(keys: Iterable[str]) -> List[ContentRevision]:
+        return ContentRevision.query.filter(ContentRevision.key.in_(list(keys))).all()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_pages(session):
+    keys = session.info.pop("bumped_revisions", None)
+    if keys:
+        page_cache.invalidate(*keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_bumped_revisions(session, previous_transaction):
+    session.info.pop("bumped_revisions", None)
@@ -0,0 +1,12 @@
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from website import db
+
+UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def upsert(model):
+    """An INSERT supporting ON CONFLICT for the dialect of the bound engine."""
+
+    return UPSERTS[db.engine.dialect.name](model)
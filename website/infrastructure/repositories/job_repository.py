@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, update
+
+from website import db
+from website.domain.models import Job
+
+
+class JobRepository:
+    @staticmethod
+    def create(kind: str, target: Optional[str], owner: str) -> Job:
+        job = Job(
+            kind=kind,
+            target=target,
+            status=Job.QUEUED,
+            owner=owner,
+            heartbeat_at=datetime.utcnow(),
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def get(job_id: int) -> Optional[Job]:
+        return db.session.get(Job, job_id)
+
+    @staticmethod
+    def claim_stale(beat_before: datetime, owner: str) -> Optional[Job]:
+        """Takes over the oldest unfinished job whose owner stopped beating.
+
+        The job passes to `owner` with a fresh beat, so its previous owner
+        stops at its next check; the caller commits.
+        """
+
+        job = (
+            Job.query.filter(
+                Job.status.in_((Job.QUEUED, Job.RUNNING)),
+                func.coalesce(Job.heartbeat_at, Job.updated_at) < beat_before,
+            )
+            .order_by(Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is not None:
+            job.owner = owner
+            job.heartbeat_at = datetime.utcnow()
+        return job
+
+    @staticmethod
+    def beat(owner: str) -> None:
+        db.session.execute(
+            update(Job)
+            .where(Job.owner == owner, Job.status.in_((Job.QUEUED, Job.RUNNING)))
+            .values(heartbeat_at=datetime.utcnow())
+        )
+
+    @staticmethod
+    def start(job: Job, total: int) -> None:
+        job.status = Job.RUNNING
+        job.total = total
+
+    @staticmethod
+    def advance(job: Job, processed: int, assets: int = 0) -> None:
+        job.processed += processed
+        job.assets_total += assets
+
+    @staticmethod
+    def add_destroyed_assets(job_id: int, count: int) -> None:
+        """Counts remote deletions; set-based, since outbox workers run in parallel."""
+
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(assets_destroyed=Job.assets_destroyed + count)
+        )
+
+    @staticmethod
+    def finish(job: Job) -> None:
+        # Cascades can remove counted rows before the job reaches them.
+        job.total = job.processed
+        job.status = Job.DONE
+        job.finished_at = datetime.utcnow()
+
+    @staticmethod
+    def fail(job: Job, error: str) -> None:
+        job.status = Job.FAILED
+        job.error = error
+        job.finished_at = datetime.utcnow()
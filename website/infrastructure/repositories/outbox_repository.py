@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+from website import db
+from website.config import Config
+from website.domain.models import OutboxMessage
+
+
+class OutboxRepository:
+    @staticmethod
+    def enqueue(kind: str, payload: dict) -> None:
+        """Adds a message to the current transaction; the caller commits it."""
+
+        db.session.add(OutboxMessage(kind=kind, payload=payload))
+
+    @staticmethod
+    def enqueue_email(to: str, subject: str, html_body: str) -> None:
+        OutboxRepository.enqueue(
+            OutboxMessage.SEND_EMAIL,
+            {"to": to, "subject": subject, "html_body": html_body},
+        )
+
+    @staticmethod
+    def enqueue_image_destroy(public_id: str) -> None:
+        OutboxRepository.enqueue(OutboxMessage.DESTROY_IMAGE, {"public_id": public_id})
+
+    @staticmethod
+    def enqueue_image_destroys(
+        public_ids: Sequence[str], job_id: Optional[int] = None
+    ) -> int:
+        """Queues the images for deletion in provider-sized batches.
+
+        Returns the number of messages added; the caller commits them.
+        """
+
+        size = Config.CLOUDINARY_DELETE_BATCH_SIZE
+        batches = [public_ids[i : i + size] for i in range(0, len(public_ids), size)]
+        for batch in batches:
+            OutboxRepository.enqueue(
+                OutboxMessage.DESTROY_IMAGES,
+                {"public_ids": list(batch), "job_id": job_id},
+            )
+        return len(batches)
+
+    @staticmethod
+    def claim_batch(limit: int) -> List[OutboxMessage]:
+        return (
+            OutboxMessage.query.filter(OutboxMessage.available_at <= datetime.utcnow())
+            .order_by(OutboxMessage.available_at, OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    @staticmethod
+    def complete(message: OutboxMessage) -> None:
+        db.session.delete(message)
+
+    @staticmethod
+    def retry_later(message: OutboxMessage, error: str, delay: timedelta) -> None:
+        message.attempts += 1
+        message.last_error = error
+        message.available_at = datetime.utcnow() + delay
+
+    @staticmethod
+    def give_up(message: OutboxMessage, error: str) -> None:
+        message.attempts += 1
+        message.last_error = error
+        message.available_at = None
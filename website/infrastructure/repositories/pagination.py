@@ -0,0 +1,135 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """Returns the (sort value, id) pair behind a cursor, or None if it is unusable.
+
+    The sort value is a timestamp for chronological pages and a number for
+    ranked ones.
+    """
+
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, (int, float)):
+            return None
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def decode_key(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Returns the primary key values behind a cursor, or None if it is unusable."""
+
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def keyset_window(
+    query: Any,
+    columns: Tuple[Any, Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Any:
+    """Restricts a query or select to the rows after the cursor, plus one extra.
+
+    The id column breaks ties between rows sharing a timestamp, so rows inserted
+    while a reader is paging never shift or repeat the pages that follow.
+    """
+
+    time_column, id_column = columns
+    position = decode_cursor(cursor)
+
+    if position is not None:
+        boundary = tuple_(time_column, id_column)
+        query = query.filter(
+            boundary < tuple_(*position) if descending else boundary > tuple_(*position)
+        )
+
+    if descending:
+        query = query.order_by(time_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(time_column.asc(), id_column.asc())
+
+    return query.limit(limit + 1)
+
+
+def keyset_page(
+    query: Query,
+    columns: Tuple[Any, Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetches one page ordered by (timestamp, id) and the cursor of the next one."""
+
+    rows = keyset_window(query, columns, limit, cursor, descending).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    time_column, id_column = columns
+    rows = rows[:limit]
+    key = key or (
+        lambda row: (getattr(row, time_column.key), getattr(row, id_column.key))
+    )
+    return rows, encode_cursor(key(rows[-1]))
+
+
+class StreamedPage:
+    """One page of rows ordered by key, fetched while the caller iterates it.
+
+    The rows come with one extra, so the cursor of the next page is known only
+    once iteration has passed the last row of this one.
+    """
+
+    def __init__(
+        self, rows: Iterator[Mapping[str, Any]], key: Sequence[str], limit: int
+    ) -> None:
+        self._rows = rows
+        self.key = list(key)
+        self.limit = limit
+        self.count = 0
+        self.next_cursor: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        last = None
+        try:
+            for row in self._rows:
+                if self.count == self.limit:
+                    self.next_cursor = encode_cursor([last[name] for name in self.key])
+                    break
+                self.count += 1
+                last = row
+                yield row
+        finally:
+            close = getattr(self._rows, "close", None)
+            if close:
+                close()
@@ -1,22 +1,83 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import contains_eager
 
 from website import db
 from website.domain.models import Post, Image, SavedPost
+from website.domain.models.post import SEARCH_CONFIG
+from .pagination import encode_cursor, keyset_page, keyset_window
+from .tag_repository import TagRepository
+
+# ts_headline wraps matches in these; callers escape the text, then swap them
+# for real markup.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+)
 
 
 class PostRepository:
     @staticmethod
-    def list_all() -> List[Post]:
-        return Post.query.order_by(Post.created_at.desc()).all()
+    def list_all(
+        limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[str]]:
+        return keyset_page(Post.query, (Post.created_at, Post.id), limit, cursor)
 
     @staticmethod
-    def get_posts_by_tags(tags: List[str]) -> List[Post]:
+    def get_posts_by_tags(
+        tags: List[str], limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[str]]:
         query = Post.query
 
-        for tag in tags:
-            query = query.filter(Post.content.ilike(f"%#{tag}%"))
+        names = list(dict.fromkeys(tag.lower() for tag in tags))
+        if names:
+            query = query.filter(Post.id.in_(TagRepository.post_ids_with_all(names)))
 
-        return query.order_by(Post.created_at.desc()).all()
+        return keyset_page(query, (Post.created_at, Post.id), limit, cursor)
+
+    @staticmethod
+    def search(
+        terms: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Ranks posts matching the terms through the GIN index on search_vector.
+
+        Rows carry the post, its rank and a highlighted snippet of the content.
+        Snippets are only built for the page being returned.
+        """
+
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, terms)
+        # ts_rank returns real; as double precision it survives the round trip
+        # through the cursor exactly, so the boundary row is not repeated.
+        rank = cast(func.ts_rank(Post.search_vector, query), Float)
+        ranked = keyset_window(
+            select(Post.id, rank.label("rank")).where(
+                Post.search_vector.op("@@")(query)
+            ),
+            (rank, Post.id),
+            limit,
+            cursor,
+        ).subquery()
+
+        rows = db.session.execute(
+            select(
+                Post,
+                ranked.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIG, Post.content, query, HEADLINE_OPTIONS
+                ).label("snippet"),
+            )
+            .join(ranked, ranked.c.id == Post.id)
+            .order_by(ranked.c.rank.desc(), Post.id.desc())
+        ).all()
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor((rows[-1].rank, rows[-1].Post.id))
 
     @staticmethod
     def get_by_id(post_id: int) -> Optional[Post]:
@@ -64,11 +125,15 @@ class SavedPostRepository:
         db.session.commit()
 
     @staticmethod
-    def list_by_user(user_id: int) -> List[Post]:
-        items = (
+    def list_by_user(
+        user_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[str]]:
+        query = (
             SavedPost.query.filter_by(user_id=user_id)
-            .join(Post)
-            .order_by(SavedPost.saved_at.desc())
-            .all()
+            .join(SavedPost.post)
+            .options(contains_eager(SavedPost.post))
+        )
+        items, next_cursor = keyset_page(
+            query, (SavedPost.saved_at, SavedPost.post_id), limit, cursor
         )
-        return [s.post for s in items]
+        return [s.post for s in items], next_cursor
@@ -0,0 +1,107 @@
+from typing import Any, List, Sequence
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import aliased
+
+from website import db
+from website.domain.models import Image, Post, PostImage, User
+from .table_repository import TableRepository
+
+_delete = TableRepository.bulk_delete
+
+
+class PurgeRepository:
+    """Set-based deletes that leave dependent rows to the database's cascades.
+
+    Each method deletes the rows with the given ids in the current transaction
+    and returns the Cloudinary public ids whose images are now unreferenced;
+    the caller queues their destruction and commits.
+    """
+
+    @staticmethod
+    def delete_users(ids: Sequence[int]) -> List[str]:
+        public_ids = list(
+            db.session.execute(
+                select(Image.public_id).where(Image.author_id.in_(ids))
+            ).scalars()
+        )
+        public_ids += db.session.execute(
+            select(User.avatar_public_id).where(
+                User.id.in_(ids), User.avatar_public_id.is_not(None)
+            )
+        ).scalars()
+        # Posts, comments, images, saved posts and codes cascade.
+        _delete(User, User.id.in_(ids))
+        return public_ids
+
+    @staticmethod
+    def delete_posts(ids: Sequence[int]) -> List[str]:
+        # Images that no other post uses go with the posts.
+        other_link = aliased(PostImage)
+        shared = exists().where(
+            other_link.image_id == Image.id, other_link.post_id.not_in(ids)
+        )
+        orphans = db.session.execute(
+            select(Image.id, Image.public_id)
+            .join(PostImage, PostImage.image_id == Image.id)
+            .where(PostImage.post_id.in_(ids), ~shared)
+            .distinct()
+        ).all()
+
+        # Comments, saved posts, tags and image links cascade.
+        _delete(Post, Post.id.in_(ids))
+        if orphans:
+            _delete(Image, Image.id.in_([image_id for image_id, _ in orphans]))
+        return [public_id for _, public_id in orphans]
+
+    @staticmethod
+    def delete_images(ids: Sequence[int]) -> List[str]:
+        public_ids = list(
+            db.session.execute(
+                select(Image.public_id).where(Image.id.in_(ids))
+            ).scalars()
+        )
+        post_ids = list(
+            db.session.execute(
+                select(PostImage.post_id).where(PostImage.image_id.in_(ids)).distinct()
+            ).scalars()
+        )
+
+        _delete(Image, Image.id.in_(ids))
+        # A post without images is removed, as when images are deleted one by one.
+        if post_ids:
+            _delete(
+                Post,
+                Post.id.in_(post_ids),
+                ~exists().where(PostImage.post_id == Post.id),
+            )
+        return public_ids
+
+    @staticmethod
+    def posts_of_users(ids: Sequence[int]) -> List[int]:
+        """The posts that delete_users takes with the users."""
+
+        return list(
+            db.session.execute(select(Post.id).where(Post.author_id.in_(ids))).scalars()
+        )
+
+    @staticmethod
+    def posts_emptied_by_images(ids: Sequence[int]) -> List[int]:
+        """The posts that delete_images removes: those left without any image."""
+
+        other_link = aliased(PostImage)
+        kept = exists().where(
+            other_link.post_id == PostImage.post_id, other_link.image_id.not_in(ids)
+        )
+        return list(
+            db.session.execute(
+                select(PostImage.post_id)
+                .where(PostImage.image_id.in_(ids), ~kept)
+                .distinct()
+            ).scalars()
+        )
+
+    @staticmethod
+    def delete_rows(model: Any, ids: Sequence[int]) -> List[str]:
+        _delete(model, model.id.in_(ids))
+        return []
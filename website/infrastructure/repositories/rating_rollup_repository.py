@@ -0,0 +1,203 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, select, tuple_
+
+from website import db
+from website.domain.models import Post, RatingRollup
+from .dialects import upsert
+
+ALL = RatingRollup.ALL
+
+
+def _rollup_keys(values: Dict[str, Any]) -> List[Tuple[str, str]]:
+    category = RatingRollup.normalize(values["category"])
+    game = RatingRollup.normalize(values["game_name"])
+    # Sorted so concurrent writers always lock rows in the same order.
+    return sorted({(category, ALL), (ALL, game), (category, game)})
+
+
+def _locked_rollups(keys: List[Tuple[str, str]]) -> List[RatingRollup]:
+    """Creates the missing rollups of `keys` and locks them all, in key order."""
+
+    db.session.execute(
+        upsert(RatingRollup)
+        .values(
+            [
+                {
+                    "category_key": category,
+                    "game_key": game,
+                    "post_count": 0,
+                    "totals": {},
+                    "histograms": {},
+                }
+                for category, game in keys
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["category_key", "game_key"])
+    )
+    return (
+        RatingRollup.query.filter(
+            tuple_(RatingRollup.category_key, RatingRollup.game_key).in_(keys)
+        )
+        .order_by(RatingRollup.category_key, RatingRollup.game_key)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+
+
+class RatingRollupRepository:
+    @staticmethod
+    def apply(values: Dict[str, Any], sign: int) -> None:
+        """Adds or removes one post in the current transaction; the caller commits.
+
+        The affected rows are locked, so concurrent edits of posts about the
+        same game serialize instead of losing updates.
+        """
+
+        for rollup in _locked_rollups(_rollup_keys(values)):
+            rollup.add(values, sign)
+            if rollup.post_count <= 0:
+                db.session.delete(rollup)
+
+    @staticmethod
+    def apply_delta(before: Dict[str, Any], after: Dict[str, Any]) -> None:
+        """Moves one edited post from its old values to its new ones.
+
+        Both key sets are locked in a single sorted pass, so two edits that
+        move posts in opposite directions cannot deadlock on each other.
+        """
+
+        removed = set(_rollup_keys(before))
+        added = set(_rollup_keys(after))
+        for rollup in _locked_rollups(sorted(removed | added)):
+            key = (rollup.category_key, rollup.game_key)
+            if key in removed:
+                rollup.add(before, -1)
+            if key in added:
+                rollup.add(after, 1)
+            if rollup.post_count <= 0:
+                db.session.delete(rollup)
+
+    @staticmethod
+    def remove(posts: Sequence[Dict[str, Any]]) -> None:
+        """Takes posts about to be deleted out of the rollups; the caller commits.
+
+        Every affected row is locked once, in key order, however many posts
+        share it.
+        """
+
+        posts_by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for values in posts:
+            for key in _rollup_keys(values):
+                posts_by_key.setdefault(key, []).append(values)
+        if not posts_by_key:
+            return
+
+        for rollup in _locked_rollups(sorted(posts_by_key)):
+            for values in posts_by_key[(rollup.category_key, rollup.game_key)]:
+                rollup.add(values, -1)
+            if rollup.post_count <= 0:
+                db.session.delete(rollup)
+
+    @staticmethod
+    def values_for_posts(ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """The rollup inputs of the posts, without loading them as objects."""
+
+        columns = [getattr(Post, field) for field in RatingRollup.RATINGS]
+        rows = db.session.execute(
+            select(Post.game_name, Post.category, *columns).where(Post.id.in_(ids))
+        )
+        return [dict(row._mapping) for row in rows]
+
+    @staticmethod
+    def top_games(limit: int, min_posts: int = 1) -> List[RatingRollup]:
+        return (
+            RatingRollup.query.filter(
+                RatingRollup.category_key == ALL,
+                RatingRollup.game_key != ALL,
+                RatingRollup.post_count >= min_posts,
+            )
+            .order_by(
+                RatingRollup.overall_average.desc(), RatingRollup.post_count.desc()
+            )
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def best_in_categories() -> List[Tuple[RatingRollup, RatingRollup]]:
+        """Pairs every category rollup with the best rated game inside it."""
+
+        position = (
+            func.row_number()
+            .over(
+                partition_by=RatingRollup.category_key,
+                order_by=(
+                    RatingRollup.overall_average.desc(),
+                    RatingRollup.post_count.desc(),
+                ),
+            )
+            .label("position")
+        )
+        ranked = (
+            select(RatingRollup.category_key, RatingRollup.game_key, position)
+            .where(RatingRollup.category_key != ALL, RatingRollup.game_key != ALL)
+            .subquery()
+        )
+        best = db.session.execute(
+            select(RatingRollup).join(
+                ranked,
+                (ranked.c.category_key == RatingRollup.category_key)
+                & (ranked.c.game_key == RatingRollup.game_key)
+                & (ranked.c.position == 1),
+            )
+        ).scalars()
+        best_by_category = {rollup.category_key: rollup for rollup in best}
+
+        categories = (
+            RatingRollup.query.filter(
+                RatingRollup.category_key != ALL, RatingRollup.game_key == ALL
+            )
+            .order_by(RatingRollup.category_name)
+            .all()
+        )
+        return [
+            (category, best_by_category[category.category_key])
+            for category in categories
+            if category.category_key in best_by_category
+        ]
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> int:
+        """Recomputes every rollup from the posts table in one transaction."""
+
+        RatingRollup.query.delete()
+        rollups: Dict[Tuple[str, str], RatingRollup] = {}
+        columns = [getattr(Post, field) for field in RatingRollup.RATINGS]
+        rows = db.session.execute(
+            select(Post.game_name, Post.category, *columns).execution_options(
+                yield_per=batch_size
+            )
+        )
+
+        count = 0
+        for row in rows:
+            values = dict(row._mapping)
+            for category, game in _rollup_keys(values):
+                rollup = rollups.get((category, game))
+                if rollup is None:
+                    rollup = RatingRollup(
+                        category_key=category,
+                        game_key=game,
+                        post_count=0,
+                        totals={},
+                        histograms={},
+                    )
+                    rollups[(category, game)] = rollup
+                rollup.add(values, 1)
+            count += 1
+
+        db.session.add_all(rollups.values())
+        db.session.commit()
+        return count
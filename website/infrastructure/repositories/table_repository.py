@@ -1,6 +1,11 @@
-from typing import Any, Dict, List, Optional
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+from sqlalchemy import MetaData, String, Table, cast, delete, func, select, tuple_
 from sqlalchemy.orm import Query
+from sqlalchemy.sql import ColumnElement, Select
 
 from website import db
 from website.domain.models import (
@@ -11,6 +16,11 @@ from website.domain.models import (
     Image,
     PostImage,
     SavedPost,
+    Tag,
+    PostTag,
+    OutboxMessage,
+    ContentRevision,
+    RatingRollup,
 )
 
 TABLES: Dict[str, Dict[str, Any]] = {
@@ -21,8 +31,53 @@ TABLES: Dict[str, Dict[str, Any]] = {
     "images": {"table": Image},
     "post_images": {"table": PostImage},
     "saved_posts": {"table": SavedPost},
+    "tags": {"table": Tag},
+    "post_tags": {"table": PostTag},
+    "outbox_messages": {"table": OutboxMessage},
+    "content_revisions": {"table": ContentRevision},
+    "rating_rollups": {"table": RatingRollup},
 }
 
+FILTER_OPERATORS = ("eq", "ne", "lt", "gt", "contains", "empty")
+
+# Reflected once per process; Table() returns the cached entry for known names.
+_reflected = MetaData()
+_reflection_lock = threading.Lock()
+
+
+def _coerce(column: Any, value: str) -> Any:
+    """Converts a filter value from the query string to the column's type."""
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if python_type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "t")
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value.strip())
+    if python_type in (int, float, Decimal):
+        return python_type(value.strip())
+    return value
+
+
+def _filter_condition(column: Any, operator: str, value: str) -> ColumnElement:
+    if operator == "empty":
+        return column.is_(None)
+    if operator == "contains":
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return cast(column, String).ilike(f"%{escaped}%", escape="\\")
+
+    value = _coerce(column, value)
+    if operator == "ne":
+        return column != value
+    if operator == "lt":
+        return column < value
+    if operator == "gt":
+        return column > value
+    return column == value
+
 
 class TableRepository:
     @staticmethod
@@ -45,15 +100,111 @@ class TableRepository:
         db.session.commit()
 
     @staticmethod
-    def bulk_delete(query: Query) -> int:
-        objs = query.all()
-        count = len(objs)
+    def model_for(table_name: str) -> Optional[Any]:
+        info = TABLES.get(table_name)
+        return info["table"] if info else None
 
-        for obj in objs:
-            db.session.delete(obj)
-        db.session.commit()
+    @staticmethod
+    def count(model: Any, *criteria: Any) -> int:
+        return db.session.scalar(
+            select(func.count()).select_from(model.__table__).where(*criteria)
+        )
+
+    @staticmethod
+    def next_ids(
+        model: Any, criteria: Sequence[Any], after_id: int, limit: int
+    ) -> List[int]:
+        return list(
+            db.session.execute(
+                select(model.id)
+                .where(*criteria, model.id > after_id)
+                .order_by(model.id)
+                .limit(limit)
+            ).scalars()
+        )
+
+    @staticmethod
+    def bulk_delete(model: Any, *criteria: Any) -> int:
+        """Deletes the matching rows with one statement; the caller commits.
+
+        No objects are loaded, so ORM delete listeners do not run and the
+        database's ON DELETE rules handle dependent rows.
+        """
+
+        result = db.session.execute(
+            delete(model)
+            .where(*criteria)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def sorted_tables() -> List[Table]:
+        """The mapped tables, each after the tables its foreign keys point to."""
+
+        return [table for table in db.metadata.sorted_tables if table.name in TABLES]
+
+    @staticmethod
+    def reflect(table_name: str) -> Optional[Table]:
+        """The table as the database defines it, reflected once per process."""
+
+        if table_name not in TABLES:
+            return None
+
+        table = _reflected.tables.get(table_name)
+        if table is None:
+            with _reflection_lock:
+                table = Table(table_name, _reflected, autoload_with=db.engine)
+        return table
+
+    @staticmethod
+    def forget_reflection() -> None:
+        """Drops the reflected tables, e.g. after the schema was restored."""
+
+        with _reflection_lock:
+            _reflected.clear()
+
+    @staticmethod
+    def select_page(
+        table: Table,
+        columns: Sequence[str],
+        filters: Sequence[Tuple[str, str, str]],
+        limit: int,
+        key: Optional[List[Any]] = None,
+    ) -> Select:
+        """Selects the given columns of the rows after `key` in primary key order.
+
+        Raises ValueError when a filter value does not fit its column's type.
+        """
+
+        key_columns = list(table.primary_key.columns)
+        statement = select(*(table.c[name] for name in columns))
+        for name, operator, value in filters:
+            statement = statement.where(
+                _filter_condition(table.c[name], operator, value)
+            )
+        if key is not None:
+            statement = statement.where(tuple_(*key_columns) > tuple_(*key))
+        return statement.order_by(*key_columns).limit(limit + 1)
+
+    @staticmethod
+    def select_all(table: Table) -> Select:
+        return select(table).order_by(*table.primary_key.columns)
+
+    @staticmethod
+    def stream(statement: Select, batch_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Runs the statement now and yields its rows from a server-side cursor."""
+
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            try:
+                for row in result.mappings():
+                    yield dict(row)
+            finally:
+                result.close()
 
-        return count
+        return rows()
 
     @staticmethod
     def get_columns(table_name: str) -> List[str]:
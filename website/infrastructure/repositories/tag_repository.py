@@ -0,0 +1,35 @@
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+from website import db
+from website.domain.models import Tag, PostTag
+from .dialects import upsert
+
+
+class TagRepository:
+    @staticmethod
+    def get_or_create(names: List[str]) -> List[Tag]:
+        if not names:
+            return []
+
+        # ON CONFLICT instead of select-then-insert: two posts introducing the
+        # same new hashtag at once must not fail on the unique name.
+        db.session.execute(
+            upsert(Tag)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        tags = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names))}
+        return [tags[name] for name in names]
+
+    @staticmethod
+    def post_ids_with_all(names: List[str]) -> Select:
+        return (
+            select(PostTag.post_id)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .where(Tag.name.in_(names))
+            .group_by(PostTag.post_id)
+            .having(func.count(PostTag.tag_id) == len(names))
+        )
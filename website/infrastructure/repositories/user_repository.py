@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from website import db
 from website.domain.models import User
+from website.infrastructure.user_cache import user_cache
 
 
 class UserRepository:
@@ -19,8 +22,10 @@ class UserRepository:
     def save(user: User) -> None:
         db.session.add(user)
         db.session.commit()
+        user_cache.invalidate(user.id)
 
     @staticmethod
-    def delete(user: User) -> None:
-        db.session.delete(user)
-        db.session.commit()
+    def disable(user: User) -> None:
+        """Marks the account disabled in the current transaction; the caller commits."""
+
+        user.disabled_at = datetime.utcnow()
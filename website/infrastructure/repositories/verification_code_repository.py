@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
 from website import db
 from website.domain.models import VerificationCode
 
@@ -5,14 +9,49 @@ from website.domain.models import VerificationCode
 class VerificationCodeRepository:
     @staticmethod
     def create(verification_code: VerificationCode) -> None:
+        """Stores the code and drops the user's earlier ones, so repeated reset
+        requests leave a single row per user.
+        """
+
+        db.session.execute(
+            delete(VerificationCode).where(
+                VerificationCode.user_id == verification_code.user_id
+            )
+        )
         db.session.add(verification_code)
         db.session.commit()
 
     @staticmethod
     def get_by_token(token: str) -> VerificationCode | None:
-        return VerificationCode.query.filter_by(token=token).first()
+        """Returns the code unless it has expired, whether or not it is deleted yet."""
+
+        return VerificationCode.query.filter(
+            VerificationCode.token == token,
+            VerificationCode.expires_at > datetime.utcnow(),
+        ).first()
 
     @staticmethod
     def invalidate(verification_code: VerificationCode) -> None:
         verification_code.is_valid = True
         db.session.commit()
+
+    @staticmethod
+    def consume(verification_code: VerificationCode) -> None:
+        db.session.delete(verification_code)
+        db.session.commit()
+
+    @staticmethod
+    def delete_expired(limit: int) -> int:
+        """Deletes up to `limit` expired codes, oldest first; the caller commits."""
+
+        expired = (
+            select(VerificationCode.id)
+            .where(VerificationCode.expires_at < datetime.utcnow())
+            .order_by(VerificationCode.expires_at)
+            .limit(limit)
+        )
+        return db.session.execute(
+            delete(VerificationCode)
+            .where(VerificationCode.id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
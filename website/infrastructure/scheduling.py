@@ -0,0 +1,202 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+
+from website.config import Config
+from website.infrastructure.metrics import job_stats
+
+
+class PeriodicJob:
+    __slots__ = ("name", "func", "seconds", "enabled")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        seconds: float,
+        enabled: Callable[[Dict[str, Any]], bool],
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.seconds = seconds
+        self.enabled = enabled
+
+
+# Jobs declared with @periodic, by name.
+PERIODIC_JOBS: Dict[str, PeriodicJob] = {}
+
+
+def periodic(
+    seconds: float, enabled: Callable[[Dict[str, Any]], bool] = lambda config: True
+):
+    """Declares a job that the scheduler leader runs every `seconds`.
+
+    The job runs inside an app context. `enabled` gets the app config and
+    decides whether the job is scheduled at all.
+    """
+
+    def decorator(func):
+        PERIODIC_JOBS[func.__name__] = PeriodicJob(
+            func.__name__, func, seconds, enabled
+        )
+        return func
+
+    return decorator
+
+
+class SchedulerLeader:
+    """Holds a Postgres advisory lock while this process runs the periodic jobs.
+
+    The lock belongs to the database session that took it, so when the
+    leader exits or loses its connection the lock is freed and another
+    process takes over on its next poll. Needs a direct or session-pooled
+    connection: PgBouncer in transaction mode shares server sessions, so
+    several processes would hold the lock at once. install_periodic_jobs
+    refuses that setup unless SCHEDULER_LOCK_DATABASE_URI bypasses PgBouncer.
+    """
+
+    def __init__(self, key: int) -> None:
+        self._key = key
+        self._lock = threading.Lock()
+        self._connection: Optional[Connection] = None
+        self.is_leader = False
+        self.since: Optional[datetime] = None
+
+    def refresh(self, engine: Engine, mode: str) -> bool:
+        with self._lock:
+            if mode == "local" or engine.dialect.name != "postgresql":
+                self._promote()
+            elif self._connection is not None:
+                try:
+                    self._connection.exec_driver_sql("SELECT 1")
+                except SQLAlchemyError as e:
+                    print(f"Scheduler leadership lost: {str(e)}")
+                    self._connection.invalidate()
+                    self._demote()
+            else:
+                self._try_acquire(engine)
+            return self.is_leader
+
+    def _try_acquire(self, engine: Engine) -> None:
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self._key}
+            ).scalar()
+        except SQLAlchemyError as e:
+            print(f"Error electing the scheduler leader: {str(e)}")
+            acquired = False
+        if acquired:
+            self._connection = connection
+            self._promote()
+        else:
+            connection.close()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": self._key}
+                    )
+                except SQLAlchemyError:
+                    self._connection.invalidate()
+            self._demote()
+
+    def _promote(self) -> None:
+        if not self.is_leader:
+            self.is_leader = True
+            self.since = datetime.utcnow()
+
+    def _demote(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+        self.is_leader = False
+        self.since = None
+
+
+leader = SchedulerLeader(Config.SCHEDULER_LOCK_KEY)
+
+
+def install_periodic_jobs(scheduler, app) -> None:
+    """Adds the leader poll and every enabled @periodic job to the scheduler.
+
+    Every process polls for leadership, but only the leader runs the jobs, so
+    adding workers does not multiply them. A run that would overlap the
+    previous one is skipped and counted.
+    """
+
+    config = app.config
+    mode = config["SCHEDULER_MODE"]
+
+    lock_engine: Optional[Engine] = None
+    if config["SCHEDULER_LOCK_DATABASE_URI"]:
+        lock_engine = create_engine(
+            config["SCHEDULER_LOCK_DATABASE_URI"], poolclass=NullPool
+        )
+    elif mode == "leader" and config["DB_PGBOUNCER"]:
+        raise RuntimeError(
+            "SCHEDULER_MODE=leader cannot elect a leader through PgBouncer in "
+            "transaction mode. Set SCHEDULER_LOCK_DATABASE_URI to a direct "
+            "database connection, or use SCHEDULER_MODE=local or off."
+        )
+
+    def poll_leadership():
+        from website import db
+
+        with app.app_context():
+            leader.refresh(lock_engine or db.engine, mode)
+
+    def run(job: PeriodicJob):
+        if not leader.is_leader:
+            return
+        started = time.perf_counter()
+        succeeded = False
+        items = 0
+        try:
+            with app.app_context():
+                handled = job.func()
+            items = handled if isinstance(handled, int) else 0
+            succeeded = True
+        except Exception as e:
+            print(f"Error running scheduled job {job.name}: {str(e)}")
+        finally:
+            elapsed = time.perf_counter() - started
+            job_stats.record(job.name, elapsed, succeeded, items)
+
+    def on_max_instances(event):
+        if event.job_id in PERIODIC_JOBS:
+            job_stats.record_overlap(event.job_id)
+
+    if mode == "off":
+        return
+
+    scheduler.add_job(
+        poll_leadership,
+        "interval",
+        id="scheduler_leader",
+        seconds=config["SCHEDULER_LEADER_POLL_SECONDS"],
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+    )
+    for job in PERIODIC_JOBS.values():
+        if job.enabled(config):
+            scheduler.add_job(
+                run,
+                "interval",
+                args=(job,),
+                id=job.name,
+                seconds=job.seconds,
+                max_instances=1,
+                coalesce=True,
+            )
+    scheduler.add_listener(on_max_instances, EVENT_JOB_MAX_INSTANCES)
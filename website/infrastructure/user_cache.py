@@ -0,0 +1,99 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+from flask_login import UserMixin
+
+from website.config import Config
+from website.domain.models import User, UserRole, UserTheme
+
+
+class CachedUser(UserMixin):
+    """Read-only identity of the signed-in user, shared between requests.
+
+    It carries what every page needs (role, theme, avatar, username); code
+    that changes the account loads the User model instead.
+    """
+
+    __slots__ = (
+        "id",
+        "username",
+        "email",
+        "avatar_url",
+        "role",
+        "theme",
+        "has_password",
+        "updated_at",
+    )
+
+    def __init__(self, user: User) -> None:
+        self.id: int = user.id
+        self.username: str = user.username
+        self.email: str = user.email
+        self.avatar_url: Optional[str] = user.avatar_url
+        self.role: UserRole = user.role
+        self.theme: UserTheme = user.theme
+        self.has_password = bool(user.password_hash)
+        self.updated_at: datetime = user.updated_at
+
+
+class UserCache:
+    """Identities of recently active users, per worker process.
+
+    Changes made through this process drop the entry right away; the TTL
+    bounds how long a change made through another worker goes unnoticed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._lock = threading.Lock()
+        self._users: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return user
+
+    def set(self, user: CachedUser, generation: int) -> None:
+        """Stores a user unless an invalidation happened while it was loaded."""
+
+        with self._lock:
+            if generation == self._generation:
+                self._users[user.id] = user
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._users.clear()
+
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._users),
+                "maxsize": self._users.maxsize,
+                "ttl": self._users.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+user_cache = UserCache(Config.USER_CACHE_SIZE, Config.USER_CACHE_TTL)
@@ -3,3 +3,5 @@ from .auth_middleware import (
     token_required,
     admin_required,
 )
+from .cache_middleware import cached_for_anonymous, conditional_get
+from .timing_middleware import init_request_timing
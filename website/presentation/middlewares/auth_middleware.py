@@ -4,7 +4,6 @@ from flask import flash, request, abort, render_template, redirect, url_for
 from flask_login import current_user
 
 from website.config import Config
-from website.infrastructure.repositories import UserRepository
 
 
 SECRET_KEY = Config.SECRET_KEY
@@ -35,11 +34,8 @@ def token_required(f):
 def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        if not current_user.is_authenticated:
-            return render_template("pages/errors/403.html"), 403
-
-        user = UserRepository.get_by_id(current_user.id)
-        if not user or user.role.name != "ADMIN":
+        # current_user is already loaded and carries the role.
+        if not current_user.is_authenticated or current_user.role.name != "ADMIN":
             return render_template("pages/errors/403.html"), 403
 
         return f(*args, **kwargs)
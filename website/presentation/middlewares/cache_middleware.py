@@ -0,0 +1,129 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import current_app, g, make_response, request, session
+from flask_login import current_user
+
+from website.domain.models import ContentRevision
+from website.infrastructure.page_cache import CachedPage, page_cache
+from website.infrastructure.repositories import ContentRevisionRepository
+
+
+def _validators(keys):
+    """Builds the ETag and Last-Modified of a page from one primary-key lookup."""
+
+    revisions = {r.key: r for r in ContentRevisionRepository.get_many(keys)}
+    parts = [
+        f"{key}={revisions[key].revision if key in revisions else 0}" for key in keys
+    ]
+    timestamps = [r.updated_at for r in revisions.values()]
+
+    etag = hashlib.sha1(";".join(parts).encode()).hexdigest()[:20]
+    last_modified = max(timestamps).replace(tzinfo=timezone.utc) if timestamps else None
+    return etag, last_modified
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional_get(keys):
+    """Answers If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    `keys` maps the view arguments to the content revisions the page shows;
+    every page also depends on ContentRevision.SITE. Signed-in pages are
+    always rendered: they carry the reader's saved posts and CSRF tokens,
+    which no revision tracks.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*view_args, **view_kwargs):
+            if (
+                request.method != "GET"
+                or current_user.is_authenticated
+                or "_flashes" in session
+            ):
+                return f(*view_args, **view_kwargs)
+
+            g.content_keys = [ContentRevision.SITE, *keys(**view_kwargs)]
+            etag, last_modified = _validators(g.content_keys)
+            g.content_etag = etag
+
+            if _is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*view_args, **view_kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            response.vary.add("Cookie")
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def cached_for_anonymous(args=()):
+    """Serves anonymous GETs of the view from the page cache.
+
+    Apply it under conditional_get: the key is the path, the listed query
+    args and the page's ETag, and the cached page is tagged with its content
+    revision keys so that bumping one drops it.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*view_args, **view_kwargs):
+            if (
+                request.method != "GET"
+                or current_user.is_authenticated
+                or "_flashes" in session
+            ):
+                return f(*view_args, **view_kwargs)
+
+            key = (
+                request.endpoint,
+                request.path,
+                tuple((name, tuple(request.args.getlist(name))) for name in args),
+                g.content_etag,
+            )
+            page = page_cache.get(key)
+            if page is not None:
+                response = current_app.response_class(
+                    page.body, status=page.status, headers=page.headers
+                )
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            generation = page_cache.generation
+            response = make_response(f(*view_args, **view_kwargs))
+            # A page that touched the session (CSRF token, flash) is personal.
+            if (
+                response.status_code == 200
+                and not response.is_streamed
+                and not session.modified
+            ):
+                page = CachedPage(
+                    response.get_data(),
+                    response.status_code,
+                    {"Content-Type": response.content_type},
+                    frozenset(g.content_keys),
+                )
+                page_cache.set(key, page, generation)
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,44 @@
+import time
+
+from flask import before_render_template, g, request, template_rendered
+
+from website.infrastructure.metrics import (
+    RequestTimings,
+    current_timings,
+    endpoint_stats,
+    register_sql_timing,
+)
+
+
+def init_request_timing(app):
+    """Times every request and reports it as Server-Timing and per endpoint."""
+
+    register_sql_timing()
+
+    @app.before_request
+    def start_timing():
+        g.request_timings = RequestTimings()
+
+    @app.after_request
+    def finish_timing(response):
+        timings = current_timings()
+        if timings is None or request.endpoint == "static":
+            return response
+
+        total = timings.elapsed()
+        endpoint_stats.record(request.endpoint or "unmatched", timings, total)
+        if app.config["SERVER_TIMING"]:
+            response.headers["Server-Timing"] = timings.server_timing(total)
+        return response
+
+    def template_started(sender, template, context, **extra):
+        if current_timings() is not None:
+            g.setdefault("template_started", []).append(time.perf_counter())
+
+    def template_finished(sender, template, context, **extra):
+        timings = current_timings()
+        if timings is not None and g.get("template_started"):
+            timings.add("template", time.perf_counter() - g.template_started.pop())
+
+    before_render_template.connect(template_started, app, weak=False)
+    template_rendered.connect(template_finished, app, weak=False)
@@ -1,13 +1,15 @@
-import os
+from datetime import datetime
 
 from flask import (
     Blueprint,
+    Response,
+    get_flashed_messages,
     render_template,
+    stream_template,
+    stream_with_context,
     request,
     url_for,
     flash,
-    send_file,
-    abort,
     jsonify,
 )
 
@@ -15,6 +17,7 @@ from website.utils import get_current_user, build_context
 from website.config import Config
 from website.presentation.middlewares import token_required, admin_required
 from website.application.services import AdminService
+from website.infrastructure.table_export import FORMATS as EXPORT_FORMATS
 
 admin_bp = Blueprint(
     "admin",
@@ -34,7 +37,24 @@ def view_database():
     table = request.args.get("table", "")
 
     table_names = admin_service.list_tables()
-    records, attributes = admin_service.get_records(table)
+    page, error = admin_service.get_records(
+        table,
+        columns=request.args.getlist("column"),
+        filters=list(
+            zip(
+                request.args.getlist("filter_column"),
+                request.args.getlist("filter_op"),
+                request.args.getlist("filter_value"),
+            )
+        ),
+        cursor=request.args.get("cursor"),
+        page_size=request.args.get("per_page", type=int),
+    )
+    if error:
+        flash(error, "danger")
+    # The session is saved before the streamed body, so the flashes are taken
+    # out of it now; the template reads them back from the request.
+    get_flashed_messages(with_categories=True)
 
     context = build_context(user, active_page="Database")
     context.update(
@@ -49,12 +69,48 @@ def view_database():
                 for table in table_names
             ],
             "table": table,
-            "attributes": attributes,
-            "records": records,
+            "query_args": {
+                name: values
+                for name, values in request.args.lists()
+                if name != "cursor"
+            },
+            **page,
         }
     )
 
-    return render_template("pages/shared/admin/database.html", **context)
+    return Response(
+        stream_template("pages/shared/admin/database.html", **context),
+        mimetype="text/html",
+    )
+
+
+@admin_bp.route("/performance/", methods=["GET"])
+@token_required
+@admin_required
+def view_performance():
+    user = get_current_user()
+    endpoints, segments = admin_service.get_performance_summary()
+
+    context = build_context(user, active_page="Performance")
+    context.update(
+        {
+            "endpoints": endpoints,
+            "segments": segments,
+            "pool": admin_service.get_pool_statistics(),
+            "page_cache": admin_service.get_page_cache_statistics(),
+            "user_cache": admin_service.get_user_cache_statistics(),
+            "scheduler": admin_service.get_scheduler_statistics(),
+        }
+    )
+
+    return render_template("pages/shared/admin/performance.html", **context)
+
+
+@admin_bp.route("/database/pool", methods=["GET"])
+@token_required
+@admin_required
+def view_pool_statistics():
+    return jsonify(admin_service.get_pool_statistics())
 
 
 @admin_bp.route("/database/<table>/<int:entry_id>", methods=["DELETE"])
@@ -70,25 +126,68 @@ def delete_single_record(table, entry_id):
 @token_required
 @admin_required
 def delete_all_records(table):
-    success, message, status_code, deleted_count = admin_service.delete_all(table)
-    flash(message, "success" if success else "danger")
-    return jsonify(success=success, deleted=deleted_count), status_code
+    success, message, status_code, job = admin_service.delete_all(table)
+    if not success:
+        flash(message, "danger")
+        return jsonify(success=False), status_code
+
+    return (
+        jsonify(
+            success=True,
+            job=job.progress(),
+            status_url=url_for(
+                "admin.view_job", job_id=job.id, token=request.args.get("token")
+            ),
+        ),
+        status_code,
+    )
 
 
-@admin_bp.route("/database/download", methods=["GET"])
+@admin_bp.route("/jobs/<int:job_id>", methods=["GET"])
 @token_required
 @admin_required
-def download_database_file():
-    db_path = admin_service.download_database()
+def view_job(job_id):
+    progress = admin_service.get_job(job_id)
+    if progress is None:
+        return jsonify(success=False, message="Job not found."), 404
+    return jsonify(progress)
 
-    if not os.path.exists(db_path):
-        abort(404)
 
-    return send_file(
-        db_path,
-        as_attachment=True,
-        download_name=Config.DB_NAME,
+@admin_bp.route("/database/<table>/export", methods=["GET"])
+@token_required
+@admin_required
+def export_table(table):
+    fmt = request.args.get("format", "csv")
+    compress = request.args.get("gzip", "0").lower() in ("1", "true", "yes")
+    success, message, chunks = admin_service.export_table(table, fmt, compress)
+    if not success:
+        return jsonify(success=False, message=message), 404
+
+    filename = f"{table}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    if compress:
+        filename += ".gz"
+    response = Response(
+        stream_with_context(chunks),
+        mimetype="application/gzip" if compress else EXPORT_FORMATS[fmt],
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    # Proxies must pass chunks through rather than buffer the whole dump.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@admin_bp.route("/database/download", methods=["GET"])
+@token_required
+@admin_required
+def download_database_file():
+    filename = f"{Config.DB_NAME}-{datetime.utcnow():%Y%m%d-%H%M%S}.backup.gz"
+    response = Response(
+        stream_with_context(admin_service.backup_database()),
+        mimetype="application/gzip",
     )
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 @admin_bp.route("/database/restore", methods=["POST"])
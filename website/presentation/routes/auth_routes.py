@@ -10,7 +10,7 @@ from flask_login import login_required
 
 from website import limiter
 from website.config import Config
-from website.extensions import google
+from website.extensions import get_google
 from website.presentation.forms import (
     RegisterForm,
     LoginForm,
@@ -42,7 +42,7 @@ def initiate_google_login():
         _external=True,
         _scheme=url_scheme,
     )
-    return google.authorize_redirect(redirect_uri)
+    return get_google().authorize_redirect(redirect_uri)
 
 
 @auth_bp.route("/google/authorize")
@@ -164,7 +164,7 @@ def reset_password():
         return redirect(url_for("auth.forgot_password"))
 
     verification_code = VerificationCodeRepository.get_by_token(token)
-    if not verification_code or verification_code.is_expired():
+    if not verification_code:
         flash(
             f"The verification link is invalid or expired.",
             "danger",
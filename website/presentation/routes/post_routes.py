@@ -4,8 +4,14 @@ from flask_login import login_required
 from website import limiter
 from website.utils import get_current_user, build_context
 from website.presentation.forms import CreatePostForm, CommentForm
-from website.presentation.middlewares import admin_required, token_required
+from website.presentation.middlewares import (
+    admin_required,
+    cached_for_anonymous,
+    conditional_get,
+    token_required,
+)
 from website.application.services import PostService, CommentService
+from website.domain.models import ContentRevision
 
 posts_bp = Blueprint(
     "posts",
@@ -17,20 +23,28 @@ posts_bp = Blueprint(
 post_service = PostService()
 
 
-
-
 @posts_bp.route("/", methods=["GET"])
 @token_required
+@conditional_get(lambda: [ContentRevision.FEED])
 def list_posts():
     user = get_current_user()
-    posts = post_service.list_posts()
+    posts, next_cursor = post_service.list_posts()
 
     context = build_context(user, active_page="Posts")
-    context["posts"] = posts
+    context.update({"posts": posts, "next_cursor": next_cursor})
 
     return render_template("pages/shared/posts/list.html", **context)
 
 
+@posts_bp.route("/feed", methods=["GET"])
+@token_required
+def list_posts_feed():
+    posts, next_cursor = post_service.list_posts(request.args.get("cursor"))
+
+    html = render_template("components/ui/post/post_grid.html", posts=posts)
+    return jsonify(html=html, next_cursor=next_cursor)
+
+
 @posts_bp.route("/new", methods=["GET", "POST"])
 @login_required
 @limiter.limit("5/hour", methods=["POST"])
@@ -141,6 +155,8 @@ def edit_post(post_id):
 
 
 @posts_bp.route("/<int:post_id>", methods=["GET"])
+@conditional_get(lambda post_id: [ContentRevision.post(post_id)])
+@cached_for_anonymous(args=("sort", "tag"))
 def view_post(post_id):
     user = get_current_user()
     post, error = post_service.get_post(post_id)
@@ -149,9 +165,37 @@ def view_post(post_id):
         return redirect(url_for("public.home"))
 
     form = CommentForm()
-    comments = CommentService().list_comments(
+    sort = request.args.get("sort", "oldest")
+    comment_service = CommentService()
+    comments, next_cursor = comment_service.list_comments(post_id=post_id, sort=sort)
+
+    context = build_context(user)
+    context.update(
+        {
+            "post": post,
+            "comments": comments,
+            "comments_count": comment_service.count_comments(post_id),
+            "next_cursor": next_cursor,
+            "sort": sort,
+            "form": form,
+            "is_authorized": bool(user),
+        }
+    )
+
+    return render_template("pages/shared/posts/detail.html", **context)
+
+
+@posts_bp.route("/<int:post_id>/comments", methods=["GET"])
+def comments_feed(post_id):
+    user = get_current_user()
+    post, _ = post_service.get_post(post_id)
+    if not post:
+        return jsonify(error="Post not found."), 404
+
+    comments, next_cursor = CommentService().list_comments(
         post_id=post_id,
         sort=request.args.get("sort", "oldest"),
+        cursor=request.args.get("cursor"),
     )
 
     context = build_context(user)
@@ -159,12 +203,13 @@ def view_post(post_id):
         {
             "post": post,
             "comments": comments,
-            "form": form,
+            "form": CommentForm(),
             "is_authorized": bool(user),
         }
     )
 
-    return render_template("pages/shared/posts/detail.html", **context)
+    html = render_template("components/ui/comment_feed.html", **context)
+    return jsonify(html=html, next_cursor=next_cursor)
 
 
 @posts_bp.route("/toggle-save/<int:post_id>", methods=["POST"])
@@ -180,14 +225,26 @@ def toggle_save(post_id):
 @login_required
 def list_saved_posts():
     user = get_current_user()
-    saved_posts = post_service.list_saved(user.id)
+    saved_posts, next_cursor = post_service.list_saved(user.id)
 
     context = build_context(user)
-    context["saved_posts"] = saved_posts
+    context.update({"saved_posts": saved_posts, "next_cursor": next_cursor})
 
     return render_template("pages/shared/posts/saved.html", **context)
 
 
+@posts_bp.route("/saved/feed", methods=["GET"])
+@login_required
+def list_saved_posts_feed():
+    user = get_current_user()
+    saved_posts, next_cursor = post_service.list_saved(
+        user.id, request.args.get("cursor")
+    )
+
+    html = render_template("components/ui/post/post_grid.html", posts=saved_posts)
+    return jsonify(html=html, next_cursor=next_cursor)
+
+
 @posts_bp.route("/delete/<int:post_id>", methods=["POST"])
 @login_required
 @limiter.limit("5/hour")
@@ -1,10 +1,20 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import (
+    Blueprint,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    jsonify,
+)
 from flask_login import login_required
 
 from website import limiter
 from website.utils import get_current_user, build_context
 from website.presentation.forms import ContactForm
 from website.application.services import PublicService
+from website.domain.models import ContentRevision
+from website.presentation.middlewares import cached_for_anonymous, conditional_get
 
 public_bp = Blueprint(
     "public",
@@ -17,6 +27,8 @@ public_service = PublicService()
 
 
 @public_bp.route("/", methods=["GET"])
+@conditional_get(lambda: [ContentRevision.FEED])
+@cached_for_anonymous(args=("tag",))
 def home():
     user = get_current_user()
     selected_tags = request.args.getlist("tag")
@@ -27,6 +39,66 @@ def home():
     return render_template("pages/shared/home.html", **context)
 
 
+@public_bp.route("/feed", methods=["GET"])
+def home_feed():
+    user = get_current_user()
+    selected_tags = request.args.getlist("tag")
+    cursor = request.args.get("cursor")
+
+    context = build_context(user, active_page="Home")
+    context.update(public_service.get_home_context(selected_tags, cursor))
+    context["hashtag_path"] = url_for("public.home")
+
+    html = render_template("components/ui/post/post_feed.html", **context)
+    return jsonify(html=html, next_cursor=context["next_cursor"])
+
+
+@public_bp.route("/leaderboard", methods=["GET"])
+@conditional_get(lambda: [ContentRevision.FEED])
+@cached_for_anonymous()
+def leaderboard():
+    user = get_current_user()
+
+    context = build_context(user, active_page="Leaderboard")
+    context.update(public_service.get_leaderboard_context())
+
+    return render_template("pages/shared/leaderboard.html", **context)
+
+
+@public_bp.route("/leaderboard/categories", methods=["GET"])
+@conditional_get(lambda: [ContentRevision.FEED])
+@cached_for_anonymous()
+def best_in_category():
+    user = get_current_user()
+
+    context = build_context(user, active_page="Leaderboard")
+    context.update(public_service.get_best_in_category_context())
+
+    return render_template("pages/shared/best_in_category.html", **context)
+
+
+@public_bp.route("/search", methods=["GET"])
+@limiter.limit("30/minute")
+def search():
+    user = get_current_user()
+
+    context = build_context(user, active_page="Search")
+    context.update(public_service.search(request.args.get("q", "")))
+
+    return render_template("pages/shared/search.html", **context)
+
+
+@public_bp.route("/search/feed", methods=["GET"])
+@limiter.limit("30/minute")
+def search_feed():
+    results = public_service.search(
+        request.args.get("q", ""), request.args.get("cursor")
+    )
+
+    html = render_template("components/ui/post/search_results.html", **results)
+    return jsonify(html=html, next_cursor=results["next_cursor"])
+
+
 @public_bp.route("/contact-me", methods=["GET", "POST"])
 @login_required
 @limiter.limit("5/hour", methods=["POST"])
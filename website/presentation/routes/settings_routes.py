@@ -2,7 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required
 
 from website import limiter
-from website.utils import get_current_user, build_context
+from website.utils import build_context, load_current_user
 from website.application.services import SettingsService
 from website.presentation.forms import UpdateProfileForm, ChangePasswordForm
 
@@ -20,7 +20,7 @@ settings_service = SettingsService()
 @login_required
 @limiter.limit("10/hour", methods=["POST"])
 def profile_settings():
-    user = get_current_user()
+    user = load_current_user()
     profile_form = UpdateProfileForm()
     password_form = ChangePasswordForm()
 
@@ -52,7 +52,7 @@ def profile_settings():
 @login_required
 @limiter.limit("10/hour")
 def delete_avatar():
-    user = get_current_user()
+    user = load_current_user()
     success, message = settings_service.delete_avatar(user)
 
     flash(message, "success" if success else "danger")
@@ -63,7 +63,7 @@ def delete_avatar():
 @login_required
 @limiter.limit("5/hour")
 def change_password():
-    user = get_current_user()
+    user = load_current_user()
     password_form = ChangePasswordForm()
 
     if password_form.validate_on_submit():
@@ -92,7 +92,7 @@ def change_password():
 @login_required
 @limiter.limit("10/minute")
 def set_theme():
-    user = get_current_user()
+    user = load_current_user()
     data = request.get_json() or {}
     theme = data.get("theme")
     success, message = settings_service.set_theme(user, theme)
@@ -107,7 +107,7 @@ def set_theme():
 @login_required
 @limiter.limit("3/day")
 def delete_account():
-    user = get_current_user()
+    user = load_current_user()
     success, message = settings_service.delete_account(user, is_admin=False)
 
     flash(message, "success" if success else "danger")
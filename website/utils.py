@@ -1,5 +1,12 @@
+import re
 import uuid
 from datetime import datetime
+from typing import List
+
+# A hashtag may follow punctuation or markup, as in (#indie) or **#retro**,
+# but not a word, URL or entity character, so page#section, /#top and &#39;
+# are not tags.
+HASHTAG_PATTERN = re.compile(r"(?<![\w/&#])#(\w+)")
 
 
 def timesince(dt, default="just now"):
@@ -26,12 +33,36 @@ def generate_username(max_length: int = 15) -> str:
     return f"{prefix}{uuid.uuid4().hex[:suffix_len]}"
 
 
+def extract_hashtags(text: str) -> List[str]:
+    names = (match.lower() for match in HASHTAG_PATTERN.findall(text or ""))
+    return list(dict.fromkeys(name for name in names if len(name) <= 100))
+
+
 def get_current_user():
     from flask_login import current_user
 
     return current_user if current_user.is_authenticated else None
 
 
+def load_current_user():
+    """Loads the signed-in User model, for views that change the account.
+
+    `current_user` is a cached read-only identity; the model is loaded once
+    per request.
+    """
+
+    from flask import g
+    from flask_login import current_user
+
+    from website.infrastructure.repositories import UserRepository
+
+    if not current_user.is_authenticated:
+        return None
+    if "current_user_model" not in g:
+        g.current_user_model = UserRepository.get_by_id(current_user.id)
+    return g.current_user_model
+
+
 def build_context(user, active_page=""):
     from website.config import Config
 
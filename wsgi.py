@@ -0,0 +1,4 @@
+from website import create_app
+
+# Production entrypoint: gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app()